@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
+import functools
 import os
+import sys
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TypeVar, cast
 
-import yaml
+from utils import yamlio
 
 
-@dataclass
+@dataclass(slots=True)
 class ComponentConfig:
     """Per-component build and quality settings (language, test/lint commands)."""
 
@@ -21,7 +24,14 @@ class ComponentConfig:
     coverage_threshold: int = 80
 
 
-@dataclass
+# Review issue severities that reject a review, per review_severity_threshold
+_BLOCKING_SEVERITIES = {
+    "error": frozenset({"error"}),
+    "warning": frozenset({"error", "warning"}),
+}
+
+
+@dataclass(slots=True)
 class QualityGateConfig:
     """Thresholds and circuit-breaker limits for the quality gate."""
 
@@ -32,8 +42,13 @@ class QualityGateConfig:
     max_test_attempts: int = 8
     max_review_attempts: int = 5
 
+    @property
+    def review_blocking_severities(self) -> frozenset[str]:
+        """Issue severities that reject a review (unknown thresholds block on errors only)."""
+        return _BLOCKING_SEVERITIES.get(self.review_severity_threshold, _BLOCKING_SEVERITIES["error"])
+
 
-@dataclass
+@dataclass(slots=True)
 class WorktreeConfig:
     """Git worktree lifecycle settings (base branch, naming prefix)."""
 
@@ -42,7 +57,7 @@ class WorktreeConfig:
     auto_cleanup: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class ReviewConfig:
     """LLM code-review settings (model, prompt file, constitution file)."""
 
@@ -51,7 +66,7 @@ class ReviewConfig:
     constitution_file: str = "./docs/CONSTITUTION.md"
 
 
-@dataclass
+@dataclass(slots=True)
 class BeadsConfig:
     """Beads task tracker integration toggles."""
 
@@ -59,7 +74,7 @@ class BeadsConfig:
     auto_sync: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class StitchConfig:
     """Google Stitch MCP integration settings."""
 
@@ -67,7 +82,7 @@ class StitchConfig:
     project_id: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class ProjectConfig:
     """Top-level project identity (name and version)."""
 
@@ -75,7 +90,7 @@ class ProjectConfig:
     version: str = "0.1.0"
 
 
-@dataclass
+@dataclass(slots=True)
 class VibraphoneConfig:
     """Root configuration parsed from vibraphone.yaml."""
 
@@ -88,19 +103,33 @@ class VibraphoneConfig:
     stitch: StitchConfig = field(default_factory=StitchConfig)
 
 
+_T = TypeVar("_T")
+
+
+def _intern(value: _T) -> _T:
+    """Intern YAML-parsed strings that are compared against literals on hot paths.
+
+    Non-string values (YAML may hold an int or null here) pass through unchanged.
+    """
+    return cast("_T", sys.intern(value)) if isinstance(value, str) else value
+
+
 def _build_config(raw: dict) -> VibraphoneConfig:
     """Build a VibraphoneConfig from parsed YAML dict."""
-    project = ProjectConfig(**raw.get("project", {}))
+    get = raw.get
+    project = ProjectConfig(**get("project", {}))
 
-    components: dict[str, ComponentConfig] = {}
-    for name, comp in raw.get("components", {}).items():
-        components[name] = ComponentConfig(**comp)
+    components = {_intern(name): ComponentConfig(**comp) for name, comp in get("components", {}).items()}
+    for comp in components.values():
+        comp.language = _intern(comp.language)
 
-    quality_gate = QualityGateConfig(**raw.get("quality_gate", {}))
-    worktree = WorktreeConfig(**raw.get("worktree", {}))
-    review = ReviewConfig(**raw.get("review", {}))
-    beads = BeadsConfig(**raw.get("beads", {}))
-    stitch = StitchConfig(**raw.get("stitch", {}))
+    quality_gate = QualityGateConfig(**get("quality_gate", {}))
+    quality_gate.review_severity_threshold = _intern(quality_gate.review_severity_threshold)
+    worktree = WorktreeConfig(**get("worktree", {}))
+    worktree.base_branch = _intern(worktree.base_branch)
+    review = ReviewConfig(**get("review", {}))
+    beads = BeadsConfig(**get("beads", {}))
+    stitch = StitchConfig(**get("stitch", {}))
 
     return VibraphoneConfig(
         project=project,
@@ -117,61 +146,114 @@ def project_root() -> Path:
     """Return the project root directory.
 
     Resolution: VIBRAPHONE_CONFIG env var parent > walk-up search for
-    vibraphone.yaml > fall back to CWD.
+    vibraphone.yaml > fall back to CWD. Memoized per (env var, CWD); call
+    reload_config() after creating or moving vibraphone.yaml.
+    """
+    return _resolve_config(os.environ.get("VIBRAPHONE_CONFIG"), os.getcwd())[1]  # noqa: PTH109
+
+
+@functools.lru_cache(maxsize=8)
+def _resolve_config(env_path: str | None, cwd: str) -> tuple[Path | None, Path]:
+    """Resolve (config file, project root) once per (VIBRAPHONE_CONFIG, cwd).
+
+    Cleared by reload_config.
     """
-    env_path = os.environ.get("VIBRAPHONE_CONFIG")
     if env_path:
         resolved = Path(env_path).resolve()
         if resolved.exists():
-            return resolved.parent
-    found = _find_config_file()
+            return resolved, resolved.parent
+    found = _find_config_file_cached(cwd, "vibraphone.yaml")
     if found:
-        return found.parent
-    return Path.cwd().resolve()
+        return found, found.parent
+    return None, Path(cwd)
 
 
 def _find_config_file(filename: str = "vibraphone.yaml") -> Path | None:
     """Walk up from CWD to find vibraphone.yaml."""
-    current = Path.cwd().resolve()
-    for directory in [current, *current.parents]:
-        candidate = directory / filename
-        if candidate.exists():
-            return candidate
-    return None
+    return _find_config_file_cached(os.getcwd(), filename)  # noqa: PTH109
+
+
+@functools.lru_cache(maxsize=32)
+def _find_config_file_cached(cwd: str, filename: str) -> Path | None:
+    """Memoized walk-up search, keyed by (cwd, filename). Cleared by reload_config.
+
+    Uses plain os.path string operations and only builds a Path for the match.
+    """
+    current = cwd
+    while True:
+        candidate = os.path.join(current, filename)  # noqa: PTH118
+        if os.path.isfile(candidate):  # noqa: PTH113
+            return Path(candidate)
+        parent = os.path.dirname(current)  # noqa: PTH120
+        if parent == current:
+            return None
+        current = parent
+
+
+# Parsed configs keyed by path, invalidated when (mtime_ns, size) changes
+_PARSE_CACHE: dict[str, tuple[tuple[int, int], VibraphoneConfig]] = {}
 
 
 def load_config(path: str | Path | None = None) -> VibraphoneConfig:
     """Load configuration from vibraphone.yaml.
 
     Resolution order: explicit path > VIBRAPHONE_CONFIG env var > walk-up search.
+    An unchanged file (same mtime and size) returns the previously parsed config.
     """
     if path is None:
         env_path = os.environ.get("VIBRAPHONE_CONFIG")
         if env_path:
             path = Path(env_path)
         else:
-            found = _find_config_file()
+            found, _ = _resolve_config(None, os.getcwd())  # noqa: PTH109
             if found is None:
                 return VibraphoneConfig()
             path = found
     else:
         path = Path(path)
 
-    if not path.exists():
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return VibraphoneConfig()
+    if st.st_size == 0:
+        # Placeholder file — nothing to parse
         return VibraphoneConfig()
 
-    with Path(path).open() as f:
-        raw = yaml.safe_load(f) or {}
+    key = str(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _PARSE_CACHE.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    # Binary mode: libyaml decodes UTF-8 itself, skipping the TextIOWrapper layer
+    with path.open("rb") as f:
+        raw = yamlio.load(f) or {}
+
+    cfg = _build_config(raw)
+    _PARSE_CACHE[key] = (stamp, cfg)
+    return cfg
+
 
-    return _build_config(raw)
+# Module-level singleton — loaded on first access of ``config``, imported by tools
+_config: VibraphoneConfig | None = None
 
 
-# Module-level singleton — loaded once, imported by tools
-config = load_config()
+def __getattr__(name: str) -> VibraphoneConfig:
+    """Lazily load the ``config`` singleton on first access (PEP 562)."""
+    global _config
+    if name == "config":
+        if _config is None:
+            _config = load_config()
+        return _config
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
 
 
 def reload_config() -> VibraphoneConfig:
     """Re-read vibraphone.yaml and update the module-level singleton."""
-    global config
-    config = load_config()
-    return config
+    global _config
+    _find_config_file_cached.cache_clear()
+    _resolve_config.cache_clear()
+    _config = load_config()
+    return _config
@@ -28,9 +28,7 @@ from tools.session_tools import recover_session
 from tools.stack_tools import configure_stack
 from tools.worktree_tools import cleanup_task, merge_task, start_task
 
-mcp = FastMCP("vibraphone")
-
-for fn in [
+_TOOLS = (
     list_tasks,
     next_ready,
     complete_task,
@@ -51,7 +49,11 @@ for fn in [
     import_gsd_plan,
     recover_session,
     configure_stack,
-]:
+)
+
+mcp = FastMCP("vibraphone")
+
+for fn in _TOOLS:
     mcp.add_tool(Tool.from_function(fn))
 
 if __name__ == "__main__":
@@ -0,0 +1,5 @@
+"""Shared pytest configuration for the vibraphone MCP server tests."""
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "git: builds a real git repository under tmp_path")
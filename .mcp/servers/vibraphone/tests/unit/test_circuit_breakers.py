@@ -2,11 +2,21 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import json
+import sys
+import threading
+from pathlib import Path
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from config import config
+from tools import quality_tools
+from tools.beads_tools import health_check
+from tools.quality_tools import _run_shell, attempt_commit, run_tests
+from tools.review_tools import request_code_review
 from utils import br_client, session
 from utils.br_client import detect_cycles, detect_orphans
 
@@ -19,6 +29,8 @@ def _isolate_session(tmp_path, monkeypatch):
     monkeypatch.setattr(session, "SESSION_DIR", tmp_path)
     monkeypatch.setattr(session, "SESSION_FILE", tmp_path / "session.json")
     monkeypatch.setattr(session, "AUDIT_LOG", tmp_path / "audit.log")
+    monkeypatch.setattr(session, "_audit_buffer", {})
+    monkeypatch.setattr(session, "_flush_timer", None)
 
 
 @pytest.fixture
@@ -63,6 +75,112 @@ class TestSessionCounters:
         session.increment_test_attempts("T-1")
         assert session.increment_test_attempts("T-2") == 1
 
+    def test_external_session_edit_is_picked_up(self, tmp_path):
+        session.increment_test_attempts("T-1")
+
+        raw = json.loads((tmp_path / "session.json").read_text())
+        raw["test_attempts"] = {"T-1": 5, "extra": 1}
+        (tmp_path / "session.json").write_text(json.dumps(raw, indent=2) + "\n")
+
+        assert session.increment_test_attempts("T-1") == 6
+
+
+class TestAuditLogBuffering:
+    def test_entries_buffered_until_flush(self, tmp_path):
+        session.audit_log("run_tests", {}, "ok", {})
+        assert not (tmp_path / "audit.log").exists()
+
+        session.flush_audit_log()
+
+        lines = (tmp_path / "audit.log").read_text().splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["tool"] == "run_tests"
+
+    def test_flushes_when_batch_full(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(session, "AUDIT_FLUSH_EVERY", 2)
+        session.audit_log("run_tests", {}, "ok", {})
+        session.audit_log("run_lint", {}, "ok", {})
+
+        assert len((tmp_path / "audit.log").read_text().splitlines()) == 2
+
+    def test_durable_entry_flushed_immediately(self, tmp_path):
+        session.audit_log("complete_task", {"task_id": "T-1"}, "ok", {}, durable=True)
+
+        assert len((tmp_path / "audit.log").read_text().splitlines()) == 1
+
+    @pytest.mark.asyncio
+    async def test_flushes_after_interval_inside_event_loop(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(session, "AUDIT_FLUSH_SECONDS", 0.01)
+        session.audit_log("run_tests", {}, "ok", {})
+        assert not (tmp_path / "audit.log").exists()
+
+        await asyncio.sleep(0.05)
+        await session.audit_flush()  # waits out the background write, if still running
+
+        assert len((tmp_path / "audit.log").read_text().splitlines()) == 1
+
+    def test_flush_after_chdir_keeps_original_log(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(session, "AUDIT_LOG", Path(".vibraphone") / "audit.log")
+        session.audit_log("run_tests", {}, "ok", {})
+
+        elsewhere = tmp_path / "elsewhere"
+        elsewhere.mkdir()
+        monkeypatch.chdir(elsewhere)
+        session.flush_audit_log()
+
+        assert len((tmp_path / ".vibraphone" / "audit.log").read_text().splitlines()) == 1
+        assert not (elsewhere / ".vibraphone").exists()
+
+    @pytest.mark.asyncio
+    async def test_audit_flush_cancels_timer_on_loop(self, tmp_path):
+        session.audit_log("run_tests", {}, "ok", {})
+        handle = session._flush_timer[1]  # noqa: SLF001
+
+        await session.audit_flush()
+
+        assert handle.cancelled()
+        assert session._flush_timer is None  # noqa: SLF001
+        assert len((tmp_path / "audit.log").read_text().splitlines()) == 1
+
+    def test_concurrent_appends_survive_background_flush(self, tmp_path, monkeypatch):
+        # Only the audit buffer is under test; keep session.json out of the race
+        monkeypatch.setattr(session, "load_session", lambda: None)
+        monkeypatch.setattr(session, "save_session", lambda _state: None)
+        writers, per_writer = 4, 2000
+        done = threading.Event()
+
+        def flusher():
+            while not done.is_set():
+                session._write_audit_buffer()  # noqa: SLF001
+
+        def writer(n):
+            for i in range(per_writer):
+                session.audit_log("run_tests", {"writer": n, "i": i}, "ok", {})
+
+        # Switch threads as often as possible to widen the append/flush race
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            background = threading.Thread(target=flusher)
+            background.start()
+            threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            done.set()
+            background.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        session.flush_audit_log()
+
+        lines = (tmp_path / "audit.log").read_text().splitlines()
+        assert len(lines) == writers * per_writer
+        assert {(e["inputs"]["writer"], e["inputs"]["i"]) for e in map(json.loads, lines)} == {
+            (n, i) for n in range(writers) for i in range(per_writer)
+        }
+
 
 # ── run_tests circuit breaker ────────────────────────────────────────
 
@@ -70,15 +188,11 @@ class TestSessionCounters:
 class TestRunTestsCircuitBreaker:
     @pytest.mark.asyncio
     async def test_escalates_after_max_attempts(self, set_active_task, mock_br_update, mock_run_shell, monkeypatch):
-        from config import config
-
         monkeypatch.setattr(config.quality_gate, "max_test_attempts", 2)
 
         set_active_task("T-1")
         mock_run_shell.return_value = (1, "FAILED")
 
-        from tools.quality_tools import run_tests
-
         # Attempts 1 and 2 should run normally
         r1 = await run_tests()
         assert r1["status"] == "fail"
@@ -96,15 +210,11 @@ class TestRunTestsCircuitBreaker:
 
     @pytest.mark.asyncio
     async def test_sets_task_blocked(self, set_active_task, mock_br_update, mock_run_shell, monkeypatch):
-        from config import config
-
         monkeypatch.setattr(config.quality_gate, "max_test_attempts", 1)
 
         set_active_task("T-1")
         mock_run_shell.return_value = (1, "FAILED")
 
-        from tools.quality_tools import run_tests
-
         await run_tests()  # attempt 1
         await run_tests()  # attempt 2 → ESCALATED
 
@@ -117,14 +227,10 @@ class TestRunTestsCircuitBreaker:
 class TestRequestCodeReviewCircuitBreaker:
     @pytest.mark.asyncio
     async def test_escalates_after_max_review_attempts(self, set_active_task, mock_br_update, monkeypatch):
-        from config import config
-
         monkeypatch.setattr(config.quality_gate, "max_review_attempts", 2)
 
         set_active_task("T-1")
 
-        from tools.review_tools import request_code_review
-
         # Burn through attempts by manually incrementing
         session.increment_review_attempts("T-1")  # 1
         session.increment_review_attempts("T-1")  # 2
@@ -157,7 +263,6 @@ class TestReviewIssueAggregation:
 
         # Mock all the I/O inside request_code_review
         diff_text = "diff --git a/foo.py b/foo.py\n+print('hi')"
-        diff_hash = hashlib.sha256(diff_text.encode()).hexdigest()
 
         new_issues = [
             {"rule": "no-unused-vars", "file": "foo.py", "line": 10, "severity": "warning", "message": "new"},
@@ -170,10 +275,9 @@ class TestReviewIssueAggregation:
 
         with (
             patch("tools.review_tools._stage_files", new_callable=AsyncMock, return_value=stage_result),
-            patch("tools.review_tools._git_diff_staged", new_callable=AsyncMock, return_value=diff_text),
-            patch("tools.review_tools._git_diff_staged_hash", new_callable=AsyncMock, return_value=diff_hash),
+            patch("tools.review_tools._git_diff_staged", new_callable=AsyncMock, return_value=diff_text.encode()),
             patch("tools.review_tools._get_changed_files", new_callable=AsyncMock, return_value=["foo.py"]),
-            patch("tools.review_tools._read_file_contents", return_value="# foo.py content"),
+            patch("tools.review_tools._read_file_contents", new_callable=AsyncMock, return_value="# foo.py content"),
             patch(
                 "tools.review_tools._perform_review",
                 new_callable=AsyncMock,
@@ -185,8 +289,6 @@ class TestReviewIssueAggregation:
             ),
             patch("tools.review_tools._load_review_files", return_value=("# Constitution", "# Prompt")),
         ):
-            from tools.review_tools import request_code_review
-
             result = await request_code_review(stage_all=True)
 
         # Should have 2 unique issues (deduped by rule+file+line)
@@ -199,7 +301,7 @@ class TestReviewIssueAggregation:
         set_active_task("T-1")
 
         diff_text = "diff --git a/foo.py b/foo.py\n+print('hi')"
-        diff_hash = hashlib.sha256(diff_text.encode()).hexdigest()
+        diff_hash = hashlib.blake2b(diff_text.encode(), digest_size=16).hexdigest()
         current_issues = [
             {"rule": "no-print", "file": "foo.py", "line": 1, "severity": "error", "message": "msg"},
         ]
@@ -210,10 +312,9 @@ class TestReviewIssueAggregation:
 
         with (
             patch("tools.review_tools._stage_files", new_callable=AsyncMock, return_value=stage_result),
-            patch("tools.review_tools._git_diff_staged", new_callable=AsyncMock, return_value=diff_text),
-            patch("tools.review_tools._git_diff_staged_hash", new_callable=AsyncMock, return_value=diff_hash),
+            patch("tools.review_tools._git_diff_staged", new_callable=AsyncMock, return_value=diff_text.encode()),
             patch("tools.review_tools._get_changed_files", new_callable=AsyncMock, return_value=["foo.py"]),
-            patch("tools.review_tools._read_file_contents", return_value="# foo.py content"),
+            patch("tools.review_tools._read_file_contents", new_callable=AsyncMock, return_value="# foo.py content"),
             patch(
                 "tools.review_tools._perform_review",
                 new_callable=AsyncMock,
@@ -225,12 +326,38 @@ class TestReviewIssueAggregation:
             ),
             patch("tools.review_tools._load_review_files", return_value=("# content", "# content")),
         ):
-            from tools.review_tools import request_code_review
-
             result = await request_code_review(stage_all=True)
 
         assert result["attempt"] == 1
         assert len(result["issues"]) == 1
+        # Stored hash must match what attempt_commit streams from git
+        state = session.load_session()
+        assert state is not None
+        assert state.last_review_diff_hash == diff_hash
+
+    @pytest.mark.asyncio
+    async def test_duplicate_issues_collapsed(self, set_active_task, monkeypatch):
+        set_active_task("T-1")
+
+        issue = {"rule": "no-print", "file": "foo.py", "line": 1, "severity": "error", "message": "msg"}
+        monkeypatch.setenv("REVIEWER_API_KEY", "fake-key")
+        stage_result = {"status": "staged", "staged": ["foo.py"], "warnings": []}
+
+        with (
+            patch("tools.review_tools._stage_files", new_callable=AsyncMock, return_value=stage_result),
+            patch("tools.review_tools._git_diff_staged", new_callable=AsyncMock, return_value=b"diff"),
+            patch("tools.review_tools._get_changed_files", new_callable=AsyncMock, return_value=["foo.py"]),
+            patch("tools.review_tools._read_file_contents", new_callable=AsyncMock, return_value="# foo.py content"),
+            patch(
+                "tools.review_tools._perform_review",
+                new_callable=AsyncMock,
+                return_value={"status": "REJECTED", "issues": [issue, dict(issue)], "raw_response": "[]"},
+            ),
+            patch("tools.review_tools._load_review_files", return_value=("# content", "# content")),
+        ):
+            result = await request_code_review(stage_all=True)
+
+        assert result["issues"] == [issue]
 
 
 # ── attempt_commit rejection ─────────────────────────────────────────
@@ -239,14 +366,12 @@ class TestReviewIssueAggregation:
 class TestAttemptCommit:
     @pytest.mark.asyncio
     async def test_rejects_without_approved_review(self):
-        from tools.quality_tools import attempt_commit
-
         result = await attempt_commit("test commit")
         assert result["status"] == "rejected"
         assert "No approved review" in result["reason"]
 
     @pytest.mark.asyncio
-    async def test_rejects_when_diff_changed(self, set_active_task):
+    async def test_rejects_when_diff_changed(self, set_active_task, mock_run_shell):
         set_active_task("T-1")
         state = session.load_session()
         assert state is not None
@@ -254,11 +379,12 @@ class TestAttemptCommit:
         state.last_review_diff_hash = "stale-hash"
         session.save_session(state)
 
-        with patch("tools.quality_tools._git_diff_staged_hash", new_callable=AsyncMock, return_value="different-hash"):
-            from tools.quality_tools import attempt_commit
+        mock_run_shell.return_value = (1, "lint failed")
 
+        with patch("tools.quality_tools._git_diff_staged_hash", new_callable=AsyncMock, return_value="different-hash"):
             result = await attempt_commit("test commit")
 
+        # A changed diff is reported ahead of the quality gate result
         assert result["status"] == "rejected"
         assert "diff changed" in result["reason"]
 
@@ -283,8 +409,6 @@ class TestAttemptCommit:
             patch("tools.quality_tools._git_diff_staged_hash", new_callable=AsyncMock, return_value=review_hash),
             patch("asyncio.create_subprocess_exec", new_callable=AsyncMock, return_value=mock_proc),
         ):
-            from tools.quality_tools import attempt_commit
-
             result = await attempt_commit("feat: add feature")
 
         assert result["status"] == "committed"
@@ -303,14 +427,34 @@ class TestAttemptCommit:
         mock_run_shell.return_value = (1, "lint failed")
 
         with patch("tools.quality_tools._git_diff_staged_hash", new_callable=AsyncMock, return_value=review_hash):
-            from tools.quality_tools import attempt_commit
-
             result = await attempt_commit("feat: add feature")
 
         assert result["status"] == "rejected"
         assert "Quality gate failed" in result["reason"]
 
 
+# ── _run_shell output bound ──────────────────────────────────────────
+
+
+class TestRunShellOutput:
+    @pytest.mark.asyncio
+    async def test_keeps_only_output_tail(self, monkeypatch):
+        monkeypatch.setattr(quality_tools, "SHELL_OUTPUT_TAIL_BYTES", 16)
+
+        rc, output = await _run_shell("printf 'x%.0s' $(seq 100); echo END; exit 2", cwd=None)
+
+        assert rc == 2
+        assert output.startswith("[... output truncated")
+        assert output.endswith("xxxxxxxxxxxxEND")
+
+    @pytest.mark.asyncio
+    async def test_short_output_untouched(self):
+        rc, output = await _run_shell("echo out; echo err >&2", cwd=None)
+
+        assert rc == 0
+        assert output == "out\nerr"
+
+
 # ── health_check structured return ───────────────────────────────────
 
 
@@ -326,8 +470,6 @@ class TestHealthCheck:
             patch.object(br_client, "br_doctor", new_callable=AsyncMock, return_value={"status": "ok"}),
             patch.object(br_client, "br_list", new_callable=AsyncMock, return_value=tasks),
         ):
-            from tools.beads_tools import health_check
-
             result = await health_check()
 
         assert "br_doctor" in result
@@ -348,8 +490,6 @@ class TestHealthCheck:
             patch.object(br_client, "br_doctor", new_callable=AsyncMock, return_value={}),
             patch.object(br_client, "br_list", new_callable=AsyncMock, return_value=tasks),
         ):
-            from tools.beads_tools import health_check
-
             result = await health_check()
 
         assert len(result["cycles"]) > 0
@@ -364,8 +504,6 @@ class TestHealthCheck:
             patch.object(br_client, "br_doctor", new_callable=AsyncMock, return_value={}),
             patch.object(br_client, "br_list", new_callable=AsyncMock, return_value=tasks),
         ):
-            from tools.beads_tools import health_check
-
             result = await health_check()
 
         assert len(result["orphans"]) == 1
@@ -379,8 +517,6 @@ class TestHealthCheck:
             patch.object(br_client, "br_doctor", new_callable=AsyncMock, return_value={}),
             patch.object(br_client, "br_list", new_callable=AsyncMock, return_value={"tasks": tasks}),
         ):
-            from tools.beads_tools import health_check
-
             result = await health_check()
 
         assert result["cycles"] == []
@@ -425,6 +561,30 @@ class TestDetectCycles:
         cycles = detect_cycles(tasks)
         assert len(cycles) >= 1
 
+    def test_deep_chain_does_not_recurse(self):
+        tasks = [{"id": str(i), "dependencies": [str(i + 1)]} for i in range(5000)]
+        assert detect_cycles(tasks) == []
+
+    def test_cycle_members_reported_once(self):
+        tasks = [
+            {"id": "A", "dependencies": ["B"]},
+            {"id": "B", "dependencies": ["C"]},
+            {"id": "C", "dependencies": ["A"]},
+            {"id": "D", "dependencies": ["A"]},
+        ]
+        assert detect_cycles(tasks) == [["A", "B", "C"]]
+
+    def test_memoized_result_not_shared_with_callers(self):
+        tasks = [{"id": "A", "dependencies": ["B"]}, {"id": "B", "dependencies": ["A"]}]
+        detect_cycles(tasks)[0].append("X")
+        assert detect_cycles(tasks) == [["A", "B"]]
+
+    def test_changed_graph_recomputed(self):
+        tasks = [{"id": "A", "dependencies": ["B"]}, {"id": "B", "dependencies": ["A"]}]
+        assert detect_cycles(tasks)
+        tasks[1]["dependencies"] = []
+        assert detect_cycles(tasks) == []
+
 
 class TestDetectOrphans:
     def test_no_orphans(self):
@@ -449,3 +609,75 @@ class TestDetectOrphans:
         ]
         orphans = detect_orphans(tasks)
         assert len(orphans) == 2
+
+
+# ── br_dep_add_many fan-out ──────────────────────────────────────────
+
+
+class TestBrDepAddMany:
+    @pytest.mark.asyncio
+    async def test_bounded_concurrency_and_ordered_results(self, monkeypatch):
+        monkeypatch.setattr(br_client, "BR_MAX_CONCURRENCY", 2)
+        in_flight = peak = 0
+
+        async def fake_dep_add(issue, depends_on):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return {"issue": issue, "depends_on": depends_on}
+
+        monkeypatch.setattr(br_client, "br_dep_add", fake_dep_add)
+        edges = [(f"T-{i}", f"T-{i - 1}") for i in range(1, 6)]
+
+        results = await br_client.br_dep_add_many(edges)
+
+        assert [(r["issue"], r["depends_on"]) for r in results] == edges
+        assert peak == 2
+
+
+# ── br_sync_coalesced debounce ───────────────────────────────────────
+
+
+class TestBrSyncCoalesced:
+    @pytest.fixture(autouse=True)
+    def _fast_debounce(self, monkeypatch):
+        monkeypatch.setattr(br_client, "BR_SYNC_DEBOUNCE_SECONDS", 0)
+        monkeypatch.setattr(br_client, "_sync_next", None)
+        monkeypatch.setattr(br_client, "_sync_running", None)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_sync(self, monkeypatch):
+        mock_sync = AsyncMock(return_value={"synced": True})
+        monkeypatch.setattr(br_client, "br_sync", mock_sync)
+
+        results = await asyncio.gather(*(br_client.br_sync_coalesced() for _ in range(5)))
+
+        assert results == [{"synced": True}] * 5
+        mock_sync.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_request_during_running_sync_gets_its_own_run(self, monkeypatch):
+        started = asyncio.Event()
+        release = asyncio.Event()
+        calls = 0
+
+        async def slow_sync():
+            nonlocal calls
+            calls += 1
+            started.set()
+            await release.wait()
+            return {}
+
+        monkeypatch.setattr(br_client, "br_sync", slow_sync)
+
+        first = asyncio.create_task(br_client.br_sync_coalesced())
+        await started.wait()
+        second = asyncio.create_task(br_client.br_sync_coalesced())
+        await asyncio.sleep(0.01)
+        assert calls == 1  # second waits for the first to finish
+        release.set()
+        await asyncio.gather(first, second)
+
+        assert calls == 2
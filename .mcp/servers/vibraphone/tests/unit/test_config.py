@@ -0,0 +1,145 @@
+"""Tests for config loading — file discovery and caching."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import config as config_mod
+from config import _find_config_file, _find_config_file_cached, load_config, project_root, reload_config
+
+
+class TestFindConfigFile:
+    def test_finds_file_in_parent_directory(self, tmp_path, monkeypatch):
+        (tmp_path / "vibraphone.yaml").write_text("project:\n  name: demo\n")
+        nested = tmp_path / "a" / "b"
+        nested.mkdir(parents=True)
+        monkeypatch.chdir(nested)
+        _find_config_file_cached.cache_clear()
+
+        assert _find_config_file() == (tmp_path / "vibraphone.yaml").resolve()
+
+    def test_repeat_lookup_hits_cache(self, tmp_path, monkeypatch):
+        (tmp_path / "vibraphone.yaml").write_text("")
+        monkeypatch.chdir(tmp_path)
+        _find_config_file_cached.cache_clear()
+
+        _find_config_file()
+        _find_config_file()
+
+        info = _find_config_file_cached.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+    def test_reload_config_rescans(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.delenv("VIBRAPHONE_CONFIG", raising=False)
+        monkeypatch.setattr(config_mod, "_config", None)
+        _find_config_file_cached.cache_clear()
+        assert _find_config_file() is None
+
+        (tmp_path / "vibraphone.yaml").write_text("project:\n  name: fresh\n")
+        cfg = reload_config()
+
+        assert cfg.project.name == "fresh"
+        assert _find_config_file() == (tmp_path / "vibraphone.yaml").resolve()
+
+
+class TestProjectRoot:
+    def test_env_var_parent_wins(self, tmp_path, monkeypatch):
+        cfg = tmp_path / "custom.yaml"
+        cfg.write_text("")
+        monkeypatch.setenv("VIBRAPHONE_CONFIG", str(cfg))
+
+        assert project_root() == tmp_path.resolve()
+
+    def test_follows_cwd_changes(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("VIBRAPHONE_CONFIG", raising=False)
+        first = tmp_path / "one"
+        second = tmp_path / "two"
+        for d in (first, second):
+            d.mkdir()
+            (d / "vibraphone.yaml").write_text("")
+
+        monkeypatch.chdir(first)
+        assert project_root() == first.resolve()
+        monkeypatch.chdir(second)
+        assert project_root() == second.resolve()
+
+    def test_cached_until_reload(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("VIBRAPHONE_CONFIG", raising=False)
+        monkeypatch.setattr(config_mod, "_config", None)
+        nested = tmp_path / "app"
+        nested.mkdir()
+        monkeypatch.chdir(nested)
+        reload_config()
+        assert project_root() == nested.resolve()
+
+        (tmp_path / "vibraphone.yaml").write_text("")
+        assert project_root() == nested.resolve()
+
+        reload_config()
+        assert project_root() == tmp_path.resolve()
+
+
+class TestLazyConfig:
+    def test_config_loaded_on_first_access(self, monkeypatch):
+        monkeypatch.setattr(config_mod, "_config", None)
+
+        cfg = config_mod.config
+
+        assert isinstance(cfg, config_mod.VibraphoneConfig)
+        assert config_mod.config is cfg
+
+    def test_unknown_attribute_raises(self):
+        with pytest.raises(AttributeError):
+            _ = config_mod.does_not_exist
+
+    def test_importing_server_does_not_load_config(self):
+        # Fresh interpreter: other tests in this process have already loaded it
+        script = "import server, config; raise SystemExit(config._config is not None)"
+        server_dir = Path(config_mod.__file__).parent
+        result = subprocess.run([sys.executable, "-c", script], cwd=server_dir, check=False)  # noqa: S603
+
+        assert result.returncode == 0
+
+
+class TestParseCache:
+    def test_unchanged_file_is_not_reparsed(self, tmp_path):
+        path = tmp_path / "vibraphone.yaml"
+        path.write_text("project:\n  name: cached\n")
+
+        assert load_config(path) is load_config(path)
+
+    def test_modified_file_is_reparsed(self, tmp_path):
+        path = tmp_path / "vibraphone.yaml"
+        path.write_text("project:\n  name: before\n")
+        first = load_config(path)
+
+        path.write_text("project:\n  name: after-edit\n")
+
+        assert load_config(path).project.name == "after-edit"
+        assert first.project.name == "before"
+
+    def test_missing_file_returns_defaults(self, tmp_path):
+        assert load_config(tmp_path / "missing.yaml").project.name == "my-app"
+
+    def test_empty_file_returns_defaults(self, tmp_path):
+        path = tmp_path / "vibraphone.yaml"
+        path.write_text("")
+
+        assert load_config(path) == config_mod.VibraphoneConfig()
+
+
+class TestReviewBlockingSeverities:
+    @pytest.mark.parametrize(
+        ("threshold", "expected"),
+        [("error", {"error"}), ("warning", {"error", "warning"}), ("info", {"error"})],
+    )
+    def test_follows_threshold(self, threshold, expected):
+        gate = config_mod.QualityGateConfig(review_severity_threshold=threshold)
+
+        assert gate.review_blocking_severities == frozenset(expected)
@@ -7,71 +7,68 @@ with controlled input.
 
 from __future__ import annotations
 
+import os
 import subprocess
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from tools.review_tools import _parse_porcelain, _stage_files, _working_dir
-from utils import session
+from tools.review_tools import _parse_porcelain, _review_client, _stage_files
+from utils import session, worktree
+from utils.worktree import working_dir
 
 
 class TestParsePorcelain:
-    """Tests for _parse_porcelain extracting paths from git status output."""
+    """Tests for _parse_porcelain extracting paths from git status -z output."""
 
     def test_modified_not_staged(self):
         """Modified in worktree but not staged: ' M file'."""
-        lines = [" M src/main.py"]
-        result = _parse_porcelain(lines)
+        result = _parse_porcelain(b" M src/main.py\0")
         assert result == ["src/main.py"]
 
     def test_modified_staged(self):
         """Modified and staged: 'M  file'."""
-        lines = ["M  src/main.py"]
-        result = _parse_porcelain(lines)
+        result = _parse_porcelain(b"M  src/main.py\0")
         assert result == ["src/main.py"]
 
     def test_added_file(self):
         """Added (staged for commit): 'A  file'."""
-        lines = ["A  src/new_file.py"]
-        result = _parse_porcelain(lines)
+        result = _parse_porcelain(b"A  src/new_file.py\0")
         assert result == ["src/new_file.py"]
 
     def test_untracked_file(self):
         """Untracked file: '?? file'."""
-        lines = ["?? src/untracked.py"]
-        result = _parse_porcelain(lines)
+        result = _parse_porcelain(b"?? src/untracked.py\0")
         assert result == ["src/untracked.py"]
 
     def test_deleted_file(self):
         """Deleted file: ' D file' or 'D  file'."""
-        lines = [" D src/old_file.py", "D  src/another_old.py"]
-        result = _parse_porcelain(lines)
+        result = _parse_porcelain(b" D src/old_file.py\0D  src/another_old.py\0")
         assert result == ["src/old_file.py", "src/another_old.py"]
 
     def test_renamed_file(self):
-        """Renamed file: 'R  old -> new' — returns destination."""
-        lines = ["R  src/old_name.py -> src/new_name.py"]
-        result = _parse_porcelain(lines)
-        assert result == ["src/new_name.py"]
+        """Renamed file: 'R  new' then a bare 'old' record — returns destination only."""
+        result = _parse_porcelain(b"R  src/new_name.py\0src/old_name.py\0 M src/other.py\0")
+        assert result == ["src/new_name.py", "src/other.py"]
 
     def test_copied_file(self):
-        """Copied file: 'C  old -> new' — returns destination."""
-        lines = ["C  src/original.py -> src/copy.py"]
-        result = _parse_porcelain(lines)
+        """Copied file: 'C  new' then a bare 'old' record — returns destination only."""
+        result = _parse_porcelain(b"C  src/copy.py\0src/original.py\0")
         assert result == ["src/copy.py"]
 
     def test_multiple_files(self):
         """Multiple files with various statuses."""
-        lines = [
-            " M src/modified.py",
-            "M  src/staged.py",
-            "A  src/added.py",
-            "?? src/untracked.py",
-            "D  src/deleted.py",
-        ]
-        result = _parse_porcelain(lines)
+        output = b"".join(
+            [
+                b" M src/modified.py\0",
+                b"M  src/staged.py\0",
+                b"A  src/added.py\0",
+                b"?? src/untracked.py\0",
+                b"D  src/deleted.py\0",
+            ]
+        )
+        result = _parse_porcelain(output)
         assert result == [
             "src/modified.py",
             "src/staged.py",
@@ -80,51 +77,39 @@ class TestParsePorcelain:
             "src/deleted.py",
         ]
 
-    def test_empty_lines_skipped(self):
-        """Empty lines are skipped."""
-        lines = [" M src/main.py", "", "M  src/other.py", "   "]
-        result = _parse_porcelain(lines)
-        assert result == ["src/main.py", "src/other.py"]
-
     def test_empty_input(self):
         """Empty input returns empty list."""
-        result = _parse_porcelain([])
-        assert result == []
-
-    def test_whitespace_only_lines(self):
-        """Lines with only whitespace are skipped."""
-        lines = ["   ", "\t", "  \t  "]
-        result = _parse_porcelain(lines)
-        assert result == []
-
-    def test_quoted_paths(self):
-        """Paths with special characters may be quoted - git status uses XY format."""
-        # Git status --porcelain uses XY prefix even for quoted paths
-        lines = ['?? "path with spaces.py"', ' M "another space.py"']
-        result = _parse_porcelain(lines)
-        # The regex strips leading quotes from the captured group
-        assert result == ["path with spaces.py", "another space.py"]
+        assert _parse_porcelain(b"") == []
+
+    def test_unusual_names_are_not_quoted(self):
+        """-z output is unquoted, so spaces, quotes and newlines survive as-is."""
+        output = b'?? path with spaces.py\0 M "quoted".py\0?? line\nbreak.py\0'
+        result = _parse_porcelain(output)
+        assert result == ["path with spaces.py", '"quoted".py', "line\nbreak.py"]
+
+    def test_non_utf8_name_round_trips(self):
+        """Undecodable bytes are kept via the filesystem encoding for git add."""
+        result = _parse_porcelain(b"?? caf\xe9.txt\0")
+        assert os.fsencode(result[0]) == b"caf\xe9.txt"
 
     def test_both_staged_and_unstaged(self):
         """File with both staged and unstaged changes: 'MM file'."""
-        lines = ["MM src/partially_staged.py"]
-        result = _parse_porcelain(lines)
+        result = _parse_porcelain(b"MM src/partially_staged.py\0")
         assert result == ["src/partially_staged.py"]
 
     def test_merge_conflict_file(self):
         """Unmerged (conflict) file: 'UU file'."""
-        lines = ["UU src/conflicted.py"]
-        result = _parse_porcelain(lines)
+        result = _parse_porcelain(b"UU src/conflicted.py\0")
         assert result == ["src/conflicted.py"]
 
 
 class TestWorkingDirResolution:
-    """Tests for _working_dir resolving session worktree paths."""
+    """Tests for working_dir resolving session worktree paths."""
 
     def test_no_session_returns_none(self, tmp_path, monkeypatch):
         """No active session returns None (inherit process cwd)."""
         monkeypatch.setattr(session, "SESSION_FILE", tmp_path / "session.json")
-        result = _working_dir()
+        result = working_dir()
         assert result is None
 
     def test_no_worktree_in_session_returns_none(self, tmp_path, monkeypatch):
@@ -132,7 +117,7 @@ class TestWorkingDirResolution:
         monkeypatch.setattr(session, "SESSION_DIR", tmp_path)
         monkeypatch.setattr(session, "SESSION_FILE", tmp_path / "session.json")
         session.save_session(session.SessionState(active_task="T-1"))
-        result = _working_dir()
+        result = working_dir()
         assert result is None
 
     def test_worktree_resolved_to_absolute_path(self, tmp_path, monkeypatch):
@@ -150,15 +135,14 @@ class TestWorkingDirResolution:
         )
 
         # Mock project_root to return tmp_path
-        from tools import review_tools
-
-        with patch.object(review_tools, "project_root", return_value=tmp_path):
-            result = _working_dir()
+        with patch.object(worktree, "project_root", return_value=tmp_path):
+            result = working_dir()
 
         assert result is not None
         assert Path(result) == worktree_path.resolve()
 
 
+@pytest.mark.git
 class TestStageFilesInWorktree:
     """Integration tests for staging files in a worktree."""
 
@@ -169,42 +153,21 @@ class TestStageFilesInWorktree:
         main_repo = tmp_path / "main"
         main_repo.mkdir()
 
-        # Initialize git repo
-        subprocess.run(["git", "init"], cwd=main_repo, check=True, capture_output=True)
-        subprocess.run(
-            ["git", "config", "user.email", "test@test.com"],
-            cwd=main_repo,
-            check=True,
-            capture_output=True,
-        )
-        subprocess.run(
-            ["git", "config", "user.name", "Test"],
-            cwd=main_repo,
-            check=True,
-            capture_output=True,
-        )
-
-        # Create initial commit
-        initial_file = main_repo / "initial.txt"
-        initial_file.write_text("initial content\n")
-        subprocess.run(
-            ["git", "add", "initial.txt"], cwd=main_repo, check=True, capture_output=True
+        # Init, initial commit, and worktree in a single shell invocation.
+        # Worktree lives inside main_repo to match relative path resolution.
+        (main_repo / "initial.txt").write_text("initial content\n")
+        script = (
+            "git init -q"
+            " && git config user.email test@test.com"
+            " && git config user.name Test"
+            " && git add initial.txt"
+            " && git -c commit.gpgsign=false commit -qm initial"
+            " && git worktree add -q worktrees/T-1 -b feat/T-1"
         )
         subprocess.run(
-            ["git", "commit", "-m", "initial"],
-            cwd=main_repo,
-            check=True,
-            capture_output=True,
+            ["sh", "-c", script], cwd=main_repo, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
         )
-
-        # Create worktree inside main_repo to match relative path resolution
         worktree_path = main_repo / "worktrees" / "T-1"
-        subprocess.run(
-            ["git", "worktree", "add", str(worktree_path), "-b", "feat/T-1"],
-            cwd=main_repo,
-            check=True,
-            capture_output=True,
-        )
 
         return main_repo, worktree_path
 
@@ -230,9 +193,7 @@ class TestStageFilesInWorktree:
         modified_file.write_text("modified content\n")
 
         # Mock project_root to return main_repo
-        from tools import review_tools
-
-        with patch.object(review_tools, "project_root", return_value=main_repo):
+        with patch.object(worktree, "project_root", return_value=main_repo):
             result = await _stage_files(None, stage_all=True)
 
         assert result["status"] == "staged", f"Result: {result}"
@@ -257,9 +218,7 @@ class TestStageFilesInWorktree:
         )
 
         # No changes in worktree
-        from tools import review_tools
-
-        with patch.object(review_tools, "project_root", return_value=main_repo):
+        with patch.object(worktree, "project_root", return_value=main_repo):
             result = await _stage_files(None, stage_all=True)
 
         assert result["status"] == "nothing_to_stage"
@@ -287,10 +246,165 @@ class TestStageFilesInWorktree:
         new_file = worktree_path / "new_file.txt"
         new_file.write_text("new content\n")
 
-        from tools import review_tools
-
-        with patch.object(review_tools, "project_root", return_value=main_repo):
+        with patch.object(worktree, "project_root", return_value=main_repo):
             result = await _stage_files(None, stage_all=True)
 
         assert result["status"] == "staged"
         assert "new_file.txt" in result["staged"]
+
+    @pytest.mark.asyncio
+    async def test_stage_files_untracked_dir_checks_each_file(self, git_repo_with_worktree, monkeypatch):
+        """Files inside a new untracked directory are filtered individually."""
+        main_repo, worktree_path = git_repo_with_worktree
+
+        session_dir = main_repo / ".vibraphone"
+        session_dir.mkdir(exist_ok=True)
+        monkeypatch.setattr(session, "SESSION_DIR", session_dir)
+        monkeypatch.setattr(session, "SESSION_FILE", session_dir / "session.json")
+        session.save_session(session.SessionState(active_task="T-1", worktree="worktrees/T-1"))
+
+        new_dir = worktree_path / "config"
+        new_dir.mkdir()
+        (new_dir / "settings.py").write_text("X = 1\n")
+        (new_dir / ".env").write_text("SECRET=1\n")
+
+        with patch.object(worktree, "project_root", return_value=main_repo):
+            result = await _stage_files(None, stage_all=True)
+
+        assert result["staged"] == ["config/settings.py"]
+        assert result["warnings"] == ["Blocked sensitive file: config/.env"]
+
+    @pytest.mark.asyncio
+    async def test_stage_files_dedupes_explicit_paths(self, git_repo_with_worktree, monkeypatch):
+        """Repeated explicit paths are staged and reported once."""
+        main_repo, worktree_path = git_repo_with_worktree
+
+        session_dir = main_repo / ".vibraphone"
+        session_dir.mkdir(exist_ok=True)
+        monkeypatch.setattr(session, "SESSION_DIR", session_dir)
+        monkeypatch.setattr(session, "SESSION_FILE", session_dir / "session.json")
+        session.save_session(session.SessionState(active_task="T-1", worktree="worktrees/T-1"))
+
+        (worktree_path / "initial.txt").write_text("modified content\n")
+
+        with patch.object(worktree, "project_root", return_value=main_repo):
+            result = await _stage_files(["initial.txt", "initial.txt"], stage_all=False)
+
+        assert result["staged"] == ["initial.txt"]
+
+    @pytest.mark.asyncio
+    async def test_stage_files_non_utf8_explicit_path(self, git_repo_with_worktree, monkeypatch):
+        """An explicit path holding undecodable bytes is staged under its raw name."""
+        main_repo, worktree_path = git_repo_with_worktree
+
+        session_dir = main_repo / ".vibraphone"
+        session_dir.mkdir(exist_ok=True)
+        monkeypatch.setattr(session, "SESSION_DIR", session_dir)
+        monkeypatch.setattr(session, "SESSION_FILE", session_dir / "session.json")
+        session.save_session(session.SessionState(active_task="T-1", worktree="worktrees/T-1"))
+
+        name = os.fsdecode(b"caf\xe9.txt")
+        (worktree_path / name).write_text("bonjour\n")
+
+        with patch.object(worktree, "project_root", return_value=main_repo):
+            result = await _stage_files([name], stage_all=False)
+
+        assert result["status"] == "staged", f"Result: {result}"
+        staged = subprocess.run(
+            ["git", "diff", "--cached", "--name-only", "-z"],
+            cwd=worktree_path,
+            capture_output=True,
+            check=True,
+        )
+        assert staged.stdout == b"caf\xe9.txt\0"
+
+    @pytest.mark.asyncio
+    async def test_stage_all_round_trips_non_utf8_name(self, git_repo_with_worktree, monkeypatch):
+        """A non-UTF-8 name parsed from git status is fed back to git add intact."""
+        main_repo, worktree_path = git_repo_with_worktree
+
+        session_dir = main_repo / ".vibraphone"
+        session_dir.mkdir(exist_ok=True)
+        monkeypatch.setattr(session, "SESSION_DIR", session_dir)
+        monkeypatch.setattr(session, "SESSION_FILE", session_dir / "session.json")
+        session.save_session(session.SessionState(active_task="T-1", worktree="worktrees/T-1"))
+
+        (worktree_path / os.fsdecode(b"caf\xe9.txt")).write_text("bonjour\n")
+
+        with patch.object(worktree, "project_root", return_value=main_repo):
+            result = await _stage_files(None, stage_all=True)
+
+        assert result["status"] == "staged", f"Result: {result}"
+        assert [os.fsencode(p) for p in result["staged"]] == [b"caf\xe9.txt"]
+        staged = subprocess.run(
+            ["git", "diff", "--cached", "--name-only", "-z"],
+            cwd=worktree_path,
+            capture_output=True,
+            check=True,
+        )
+        assert staged.stdout == b"caf\xe9.txt\0"
+
+    @pytest.mark.asyncio
+    async def test_stage_files_failure_stages_nothing(self, git_repo_with_worktree, monkeypatch):
+        """A failing git add leaves the index untouched and reports nothing staged."""
+        main_repo, worktree_path = git_repo_with_worktree
+
+        session_dir = main_repo / ".vibraphone"
+        session_dir.mkdir(exist_ok=True)
+        monkeypatch.setattr(session, "SESSION_DIR", session_dir)
+        monkeypatch.setattr(session, "SESSION_FILE", session_dir / "session.json")
+        session.save_session(session.SessionState(active_task="T-1", worktree="worktrees/T-1"))
+
+        (worktree_path / "initial.txt").write_text("modified content\n")
+
+        with patch.object(worktree, "project_root", return_value=main_repo):
+            result = await _stage_files(["initial.txt", "missing.txt"], stage_all=False)
+
+        assert result["status"] == "error"
+        assert result["staged"] == []
+        staged = subprocess.run(
+            ["git", "diff", "--cached", "--name-only"],
+            cwd=worktree_path,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert staged.stdout == ""
+
+
+class TestReviewClient:
+    """Tests for _review_client leasing, replacing and closing the shared OpenRouter client."""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_client(self, monkeypatch):
+        monkeypatch.setattr("tools.review_tools._client", None)
+        monkeypatch.setattr("tools.review_tools._leases", {})
+        monkeypatch.setattr("tools.review_tools.AsyncOpenAI", MagicMock(side_effect=lambda **_: AsyncMock()))
+
+    @pytest.mark.asyncio
+    async def test_reuses_client_for_same_key(self):
+        """Repeat leases on one loop with one key get the same client."""
+        async with _review_client("key-a") as first:
+            pass
+        async with _review_client("key-a") as again:
+            assert again is first
+        first.close.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_closes_idle_replaced_client(self):
+        """Switching api_key closes the old client right away when nothing is using it."""
+        async with _review_client("key-a") as first:
+            pass
+        async with _review_client("key-b") as second:
+            assert second is not first
+            first.close.assert_awaited_once()
+        second.close.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_defers_close_until_in_flight_review_ends(self):
+        """A replaced client stays open until the review still holding it finishes."""
+        async with _review_client("key-a") as first:
+            async with _review_client("key-b"):
+                first.close.assert_not_awaited()
+            first.close.assert_not_awaited()
+        first.close.assert_awaited_once()
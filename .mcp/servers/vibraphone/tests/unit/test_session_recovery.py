@@ -7,6 +7,7 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from tools.session_tools import recover_session
 from utils import br_client, session
 
 # ── Fixtures ──────────────────────────────────────────────────────────
@@ -18,6 +19,13 @@ def _isolate_session(tmp_path, monkeypatch):
     monkeypatch.setattr(session, "SESSION_DIR", tmp_path)
     monkeypatch.setattr(session, "SESSION_FILE", tmp_path / "session.json")
     monkeypatch.setattr(session, "AUDIT_LOG", tmp_path / "audit.log")
+    monkeypatch.setattr(session, "_audit_buffer", {})
+    monkeypatch.setattr(session, "_flush_timer", None)
+
+
+# Staleness anchor, captured once at import. Not a fixed date: recover_session
+# measures staleness against the real clock.
+_NOW = datetime.now(UTC)
 
 
 def _make_session(
@@ -26,7 +34,7 @@ def _make_session(
     minutes_ago: int = 5,
 ) -> None:
     """Write a session with an active task at a given staleness."""
-    ts = (datetime.now(UTC) - timedelta(minutes=minutes_ago)).isoformat()
+    ts = (_NOW - timedelta(minutes=minutes_ago)).isoformat()
     state = session.SessionState(
         active_task=task_id,
         worktree=worktree,
@@ -45,8 +53,6 @@ class TestCleanSession:
     @pytest.mark.asyncio
     async def test_clean_session_no_task(self):
         """No session file at all → clean."""
-        from tools.session_tools import recover_session
-
         result = await recover_session()
         assert result["status"] == "clean"
         assert result["action"] == "none"
@@ -58,8 +64,6 @@ class TestCleanSession:
         """Session file exists but active_task is None → clean."""
         session.save_session(session.SessionState())
 
-        from tools.session_tools import recover_session
-
         result = await recover_session()
         assert result["status"] == "clean"
         assert result["action"] == "none"
@@ -75,8 +79,6 @@ class TestFreshSession:
 
         _make_session(worktree=str(worktree_path), minutes_ago=5)
 
-        from tools.session_tools import recover_session
-
         result = await recover_session()
         assert result["status"] == "active"
         assert result["action"] == "resume"
@@ -103,8 +105,6 @@ class TestStaleSession:
             ) as mock_show,
             patch.object(br_client, "br_update", new_callable=AsyncMock, return_value={}) as mock_update,
         ):
-            from tools.session_tools import recover_session
-
             result = await recover_session()
 
         assert result["status"] == "stale"
@@ -121,22 +121,16 @@ class TestStaleSession:
         assert state.active_task is None
 
     @pytest.mark.asyncio
-    async def test_stale_session_worktree_exists(self, tmp_path):
+    async def test_stale_session_worktree_exists(self, tmp_path, monkeypatch):
         """Active task >= 30 min, worktree present → resume with stale flag."""
         worktree_path = tmp_path / "worktrees" / "T-1"
         worktree_path.mkdir(parents=True)
 
         _make_session(worktree=str(worktree_path), minutes_ago=60)
 
-        with patch.object(
-            br_client,
-            "br_show",
-            new_callable=AsyncMock,
-            return_value={"status": "in_progress"},
-        ):
-            from tools.session_tools import recover_session
+        monkeypatch.setattr(br_client, "br_show", AsyncMock(return_value={"status": "in_progress"}))
 
-            result = await recover_session()
+        result = await recover_session()
 
         assert result["status"] == "stale"
         assert result["action"] == "resume"
@@ -146,19 +140,13 @@ class TestStaleSession:
         assert "get_task_context" in result["next_steps"][0]
 
     @pytest.mark.asyncio
-    async def test_stale_session_task_already_closed(self):
+    async def test_stale_session_task_already_closed(self, monkeypatch):
         """Active task >= 30 min, task no longer in_progress → cleans up."""
         _make_session(worktree="/some/path", minutes_ago=60)
 
-        with patch.object(
-            br_client,
-            "br_show",
-            new_callable=AsyncMock,
-            return_value={"status": "closed"},
-        ):
-            from tools.session_tools import recover_session
+        monkeypatch.setattr(br_client, "br_show", AsyncMock(return_value={"status": "closed"}))
 
-            result = await recover_session()
+        result = await recover_session()
 
         assert result["status"] == "stale"
         assert result["action"] == "cleaned_up"
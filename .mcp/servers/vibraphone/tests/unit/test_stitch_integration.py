@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 import json
-from unittest.mock import patch
+import stat
+from pathlib import Path
 
 import pytest
 import yaml
 
-from tools.stack_tools import STITCH_MCP_ENTRY, _sync_mcp_config, _update_env_var
+from tools import stack_tools
+from tools.stack_tools import STITCH_MCP_ENTRY, _sync_mcp_config, _update_env_var, configure_stack
 
 # ── Fixtures ──────────────────────────────────────────────────────────
 
@@ -99,6 +101,37 @@ class TestSyncMcpConfig:
         config = json.loads((project / ".mcp" / "config.json").read_text())
         assert "vibraphone" in config["mcpServers"]
 
+    def test_external_edit_invalidates_cache(self, project):
+        _sync_mcp_config(stitch_enabled=True, project_root=project)
+
+        # Remove stitch behind the cache's back
+        config_path = project / ".mcp" / "config.json"
+        config = json.loads(config_path.read_text())
+        del config["mcpServers"]["stitch"]
+        config_path.write_text(json.dumps(config, indent=2) + "\n")
+
+        result = _sync_mcp_config(stitch_enabled=True, project_root=project)
+        assert result["stitch_config_changed"] is True
+
+    def test_failed_write_keeps_original(self, project, monkeypatch):
+        config_path = project / ".mcp" / "config.json"
+        original = config_path.read_text()
+
+        def fail_replace(*_args):
+            msg = "disk full"
+            raise OSError(msg)
+
+        monkeypatch.setattr(Path, "replace", fail_replace)
+        with pytest.raises(OSError, match="disk full"):
+            _sync_mcp_config(stitch_enabled=True, project_root=project)
+        monkeypatch.undo()
+
+        assert config_path.read_text() == original
+        assert list(config_path.parent.iterdir()) == [config_path]  # temp file cleaned up
+        # The in-memory edit was dropped along with the failed write
+        result = _sync_mcp_config(stitch_enabled=True, project_root=project)
+        assert result["stitch_config_changed"] is True
+
 
 # ── _update_env_var tests ─────────────────────────────────────────────
 
@@ -134,25 +167,53 @@ class TestUpdateEnvVar:
         content = (project / ".env").read_text()
         assert "STITCH_PROJECT_ID=proj-123" in content
 
+    def test_preserves_existing_mode(self, project):
+        env_path = project / ".env"
+        env_path.write_text("FOO=old\n")
+        env_path.chmod(0o600)
+
+        _update_env_var("FOO", "new", project)
+
+        assert stat.S_IMODE(env_path.stat().st_mode) == 0o600
+        assert "FOO=new" in env_path.read_text()
+
+    def test_new_env_is_owner_only(self, project):
+        _update_env_var("STITCH_PROJECT_ID", "proj-123", project)
+
+        assert stat.S_IMODE((project / ".env").stat().st_mode) == 0o600
+
+    def test_symlinked_env_stays_a_link(self, project):
+        real = project / "secrets.env"
+        real.write_text("FOO=old\n")
+        (project / ".env").symlink_to(real)
+
+        _update_env_var("FOO", "new", project)
+
+        assert (project / ".env").is_symlink()
+        assert real.read_text() == "FOO=new\n"
+
+    def test_preserves_comments_and_unchanged_is_noop(self, project):
+        (project / ".env").write_text("# secrets\nFOO = old\n\nBAR=baz\n")
+
+        assert _update_env_var("FOO", "new", project) is True
+        assert _update_env_var("FOO", "new", project) is False
+
+        assert (project / ".env").read_text() == "# secrets\nFOO=new\n\nBAR=baz\n"
+
 
 # ── configure_stack integration tests ─────────────────────────────────
 
 
 class TestConfigureStackStitch:
     @pytest.fixture(autouse=True)
-    def _patch_config(self, project):
-        """Patch _find_config_file to point at the tmp project's vibraphone.yaml."""
-        with (
-            patch("tools.stack_tools._find_config_file", return_value=project / "vibraphone.yaml"),
-            patch("tools.stack_tools.reload_config"),
-        ):
-            self.project = project
-            yield
+    def _patch_config(self, project, monkeypatch):
+        """Point _find_config_file at the tmp project's vibraphone.yaml; make reload a no-op."""
+        monkeypatch.setattr(stack_tools, "_find_config_file", lambda: project / "vibraphone.yaml")
+        monkeypatch.setattr(stack_tools, "reload_config", lambda: None)
+        self.project = project
 
     @pytest.mark.asyncio
     async def test_stitch_project_id_enables_stitch(self):
-        from tools.stack_tools import configure_stack
-
         components = {
             "backend": {"language": "python", "root": "./backend"},
         }
@@ -176,8 +237,6 @@ class TestConfigureStackStitch:
 
     @pytest.mark.asyncio
     async def test_configure_stack_preview_no_sync(self):
-        from tools.stack_tools import configure_stack
-
         components = {
             "backend": {"language": "python", "root": "./backend"},
         }
@@ -195,8 +254,6 @@ class TestConfigureStackStitch:
 
     @pytest.mark.asyncio
     async def test_enable_disable_roundtrip(self):
-        from tools.stack_tools import configure_stack
-
         components = {
             "backend": {"language": "python", "root": "./backend"},
         }
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import re
 
-from config import config, project_root
+import config
+from config import project_root
 from utils import br_client, session
+from utils.planning import resolve_phase_dir
+from utils.textcache import read_if_exists
 
 
 async def list_tasks(status_filter: str | None = None) -> dict:
@@ -38,15 +42,15 @@ async def next_ready() -> dict:
 async def complete_task(task_id: str) -> dict:
     """Mark a task as complete and optionally sync."""
     result = await br_client.br_close(task_id)
-    if config.beads.auto_sync:
-        await br_client.br_sync()
+    if config.config.beads.auto_sync:
+        await br_client.br_sync_coalesced()
     session.clear_task()
 
     result["next_steps"] = [
         "1. Call next_ready() to pick up the next task",
     ]
 
-    session.audit_log("complete_task", {"task_id": task_id}, "ok", result)
+    session.audit_log("complete_task", {"task_id": task_id}, "ok", result, durable=True)
     return result
 
 
@@ -59,7 +63,7 @@ async def abandon_task(task_id: str) -> dict:
         "1. Call next_ready() to get a different task",
     ]
 
-    session.audit_log("abandon_task", {"task_id": task_id}, "ok", result)
+    session.audit_log("abandon_task", {"task_id": task_id}, "ok", result, durable=True)
     return result
 
 
@@ -69,10 +73,8 @@ async def health_check() -> dict:
     Returns structured JSON:
         {"br_doctor": <raw doctor output>, "cycles": [...], "orphans": [...]}
     """
-    doctor_result = await br_client.br_doctor()
-
-    # Fetch task list for graph analysis
-    tasks_result = await br_client.br_list()
+    # Doctor and the task list (for graph analysis) are independent br calls
+    doctor_result, tasks_result = await asyncio.gather(br_client.br_doctor(), br_client.br_list())
     tasks = tasks_result if isinstance(tasks_result, list) else tasks_result.get("tasks", [])
 
     cycles = br_client.detect_cycles(tasks)
@@ -90,15 +92,41 @@ async def health_check() -> dict:
 _PLAN_LABEL_RE = re.compile(r"plan:(\S+)")
 
 
+def _plan_id_from_labels(labels: list[str] | str | None) -> str | None:
+    """Return <id> from the first ``plan:<id>`` label, if any."""
+    if isinstance(labels, str):
+        match = _PLAN_LABEL_RE.search(labels)
+        return match.group(1) if match else None
+    # Label lists hold exact tokens: a prefix check avoids joining + regex
+    for label in labels or ():
+        if isinstance(label, str) and label.startswith("plan:") and label[5:].strip():
+            return label[5:].split()[0]
+    return None
+
+
+def _read_plan(plan_id: str) -> str | None:
+    """Read the PLAN.md for *plan_id* (e.g. "1-2"), or None if it's missing."""
+    # Derive phase number from plan_id: "1-2" → phase 1
+    phase_dir = resolve_phase_dir(plan_id.split("-")[0])
+    return read_if_exists(phase_dir / f"{plan_id}-PLAN.md") if phase_dir else None
+
+
 async def get_task_context(task_id: str) -> dict:
     """Load focused context for a task: task details, originating plan, architecture, and recent commits.
 
     Returns a structured bundle so the agent gets only relevant context
     instead of loading entire files on every task switch.
     """
-    task = await br_client.br_show(task_id)
     root = project_root()
 
+    # The task lookup, branch log and ARCHITECTURE.md (compact, context-dense)
+    # read are independent; file I/O runs off the event loop
+    task, recent_commits, architecture = await asyncio.gather(
+        br_client.br_show(task_id),
+        br_client.git_log(f"feat/{task_id}"),
+        asyncio.to_thread(read_if_exists, root / "docs" / "ARCHITECTURE.md"),
+    )
+
     # Unwrap br_show's {"items": [...]} envelope to get the actual task dict
     task_item = task
     if isinstance(task, dict) and "items" in task:
@@ -106,35 +134,9 @@ async def get_task_context(task_id: str) -> dict:
         if items:
             task_item = items[0]
 
-    # Extract plan label (set by bridge_tools during import)
-    plan_content: str | None = None
-    labels = task_item.get("labels", []) or []
-    if isinstance(labels, list):
-        labels = " ".join(labels)
-    match = _PLAN_LABEL_RE.search(labels)
-    if match:
-        plan_id = match.group(1)  # e.g. "1-2"
-        # Derive phase number from plan_id: "1-2" → phase 1
-        phase_number = plan_id.split("-")[0]
-        # GSD uses zero-padded directory names like "01-core-crawler-foundation"
-        padded = phase_number.zfill(2)
-        phases_dir = root / ".planning" / "phases"
-        phase_dirs = sorted(phases_dir.glob(f"{padded}-*"))
-        if phase_dirs:
-            plan_path = phase_dirs[0] / f"{plan_id}-PLAN.md"
-        else:
-            plan_path = phases_dir / phase_number / f"{plan_id}-PLAN.md"
-        if plan_path.exists():
-            plan_content = plan_path.read_text()
-
-    # Read ARCHITECTURE.md (compact, context-dense)
-    arch_path = root / "docs" / "ARCHITECTURE.md"
-    architecture: str | None = None
-    if arch_path.exists():
-        architecture = arch_path.read_text()
-
-    # Recent commits on task branch
-    recent_commits = await br_client.git_log(f"feat/{task_id}")
+    # Plan label is set by bridge_tools during import
+    plan_id = _plan_id_from_labels(task_item.get("labels"))
+    plan_content = await asyncio.to_thread(_read_plan, plan_id) if plan_id else None
 
     result = {
         "task": task,
@@ -163,8 +165,8 @@ async def triage() -> dict:
     Requires JSONL to be current (auto-synced on state transitions).
     """
     # Ensure JSONL is fresh before triage
-    if config.beads.auto_sync:
-        await br_client.br_sync()
+    if config.config.beads.auto_sync:
+        await br_client.br_sync_coalesced()
     result = await br_client.bv_run("--robot-triage")
 
     # Extract recommended task from triage output
@@ -203,8 +205,8 @@ async def plan_parallel() -> dict:
     Requires JSONL to be current (auto-synced on state transitions).
     """
     # Ensure JSONL is fresh before planning
-    if config.beads.auto_sync:
-        await br_client.br_sync()
+    if config.config.beads.auto_sync:
+        await br_client.br_sync_coalesced()
     result = await br_client.bv_run("--robot-plan")
 
     result["next_steps"] = [
@@ -245,19 +247,13 @@ async def add_task(
     )
     new_id = str(result.get("id", result.get("issue_id", "")))
 
-    deps_created: list[dict] = []
-
-    # depends_on: new task is blocked by these
-    for dep_id in depends_on or []:
-        await br_client.br_dep_add(new_id, dep_id)
-        deps_created.append({"blocked": new_id, "blocker": dep_id})
+    # depends_on: new task is blocked by these; blocks: these are blocked by new task
+    edges = [(new_id, dep_id) for dep_id in depends_on or []]
+    edges.extend((blocked_id, new_id) for blocked_id in blocks or [])
 
-    # blocks: these tasks are blocked by new task
-    for blocked_id in blocks or []:
-        await br_client.br_dep_add(blocked_id, new_id)
-        deps_created.append({"blocked": blocked_id, "blocker": new_id})
+    await br_client.br_dep_add_many(edges)
 
-    result["dependencies_added"] = deps_created
+    result["dependencies_added"] = [{"blocked": blocked, "blocker": blocker} for blocked, blocker in edges]
 
     # Check if dependencies are satisfied for next_steps guidance
     has_deps = bool(depends_on)
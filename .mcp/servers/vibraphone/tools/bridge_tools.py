@@ -8,17 +8,18 @@ Beads issues with the correct dependency graph for execution.
 
 from __future__ import annotations
 
+import asyncio
+import io
+import itertools
+import os
 import re
-from typing import TYPE_CHECKING
+from pathlib import Path
 
-import yaml
+from defusedxml.ElementTree import iterparse
 
-if TYPE_CHECKING:
-    from pathlib import Path
-from defusedxml.ElementTree import fromstring as parse_xml
-
-from config import config, project_root
-from utils import br_client, session
+import config
+from utils import br_client, session, yamlio
+from utils.planning import resolve_phase_dir
 
 # ---------------------------------------------------------------------------
 # Parsing layer (pure functions, no I/O)
@@ -32,54 +33,52 @@ _NEW_COMPONENT_RE = re.compile(
 )
 
 
-def _extract_frontmatter(content: str) -> dict:
-    """Extract YAML frontmatter from between --- fences."""
+def _split_frontmatter(content: str) -> tuple[dict, str]:
+    """Split a plan into (YAML frontmatter between --- fences, remaining body)."""
     match = _FRONTMATTER_RE.match(content)
     if not match:
-        return {}
-    return yaml.safe_load(match.group(1)) or {}
+        return {}, content
+    return yamlio.load(match.group(1)) or {}, content[match.end() :]
 
 
-_BARE_AMP_RE = re.compile(r"&(?!amp;|lt;|gt;|quot;|apos;|#)")
 # Structural XML tags used in GSD plan files (opening, closing, or self-closing)
 _KNOWN_TAGS = r"tasks|task|name|files|action|verify|done|title|description|labels|type"
-_STRUCTURAL_TAG_RE = re.compile(rf"<(?:/?(?:{_KNOWN_TAGS})\b)")
+# Bare '&' that doesn't start an entity, or '<' that doesn't open (or close) a known tag
+_UNSAFE_XML_RE = re.compile(rf"&(?!amp;|lt;|gt;|quot;|apos;|#)|<(?!/?(?:{_KNOWN_TAGS})\b)")
+_XML_ESCAPES = {"&": "&amp;", "<": "&lt;"}
 
 
 def _sanitize_xml_content(raw: str) -> str:
     """Escape '&' and '<' that aren't part of known XML structure."""
-    raw = _BARE_AMP_RE.sub("&amp;", raw)
-    # Escape '<' that don't start a known structural tag
-    result: list[str] = []
-    i = 0
-    while i < len(raw):
-        if raw[i] == "<":
-            if _STRUCTURAL_TAG_RE.match(raw, i):
-                result.append("<")
-            else:
-                result.append("&lt;")
-        else:
-            result.append(raw[i])
-        i += 1
-    return "".join(result)
+    # Well-formed plans (the common case) need no rewrite at all
+    if _UNSAFE_XML_RE.search(raw) is None:
+        return raw
+    return _UNSAFE_XML_RE.sub(lambda m: _XML_ESCAPES[m.group()], raw)
 
 
 def _extract_tasks_from_xml(body: str) -> list[dict]:
-    """Find <tasks>...</tasks> block and parse each <task> element."""
+    """Find <tasks>...</tasks> block and parse each top-level <task> element.
+
+    Streams the block with iterparse and clears each task subtree once its
+    fields have been collected. defusedxml stays in place even though the
+    sanitize pass already escapes any '<!' DTD opener: it costs well under a
+    millisecond per plan, next to tens of milliseconds per br spawn.
+    """
     match = _TASKS_RE.search(body)
     if not match:
         return []
 
     inner = _sanitize_xml_content(match.group(1))
-    xml_str = f"<tasks>{inner}</tasks>"
-    root = parse_xml(xml_str)
-
-    tasks = []
-    for task_el in root.findall("task"):
-        task_data: dict = {}
-        for child in task_el:
-            task_data[child.tag] = (child.text or "").strip()
-        tasks.append(task_data)
+    tasks: list[dict] = []
+    depth = 0
+    for event, el in iterparse(io.StringIO(f"<tasks>{inner}</tasks>"), events=("start", "end")):
+        if event == "start":
+            depth += 1
+            continue
+        depth -= 1
+        if depth == 1 and el.tag == "task":
+            tasks.append({child.tag: (child.text or "").strip() for child in el})
+            el.clear()
     return tasks
 
 
@@ -123,33 +122,24 @@ async def _setup_plan_dependencies(
     Returns:
         List of dependency records {blocked, blocker, type}.
     """
-    deps_created: list[dict] = []
+    edges: list[tuple[str, str, str]] = []  # (blocked, blocker, type)
 
     for plan_id, task_ids in plan_tasks.items():
         # Intra-plan: sequential execution (task N+1 blocked by task N)
-        for i in range(1, len(task_ids)):
-            blocked = task_ids[i]
-            blocker = task_ids[i - 1]
-            await br_client.br_dep_add(blocked, blocker)
-            deps_created.append({"blocked": blocked, "blocker": blocker, "type": "intra-plan"})
+        edges.extend((blocked, blocker, "intra-plan") for blocker, blocked in itertools.pairwise(task_ids))
 
         # Inter-plan: first task of this plan blocked by last task of each dep
         if plan_id in plan_deps and task_ids:
-            first_task = task_ids[0]
-            for dep_plan_id in plan_deps[plan_id]:
-                dep_task_ids = all_plans_map.get(dep_plan_id, [])
-                if dep_task_ids:
-                    last_dep_task = dep_task_ids[-1]
-                    await br_client.br_dep_add(first_task, last_dep_task)
-                    deps_created.append(
-                        {
-                            "blocked": first_task,
-                            "blocker": last_dep_task,
-                            "type": "inter-plan",
-                        }
-                    )
-
-    return deps_created
+            edges.extend(
+                (task_ids[0], all_plans_map[dep_plan_id][-1], "inter-plan")
+                for dep_plan_id in plan_deps[plan_id]
+                if all_plans_map.get(dep_plan_id)
+            )
+
+    # Edges are independent of each other, so wire them up concurrently
+    await br_client.br_dep_add_many([(blocked, blocker) for blocked, blocker, _ in edges])
+
+    return [{"blocked": blocked, "blocker": blocker, "type": type_} for blocked, blocker, type_ in edges]
 
 
 # ---------------------------------------------------------------------------
@@ -159,16 +149,35 @@ async def _setup_plan_dependencies(
 _PLAN_FILE_RE = re.compile(r"^(\d+-\d+)-PLAN\.md$")
 
 
-def _resolve_phase_dir(phase_number: int) -> Path | None:
-    """Locate the phase directory for a given phase number."""
-    root = project_root()
-    padded = str(phase_number).zfill(2)
-    phases_dir = root / ".planning" / "phases"
-    candidates = sorted(phases_dir.glob(f"{padded}-*"))
-    if not candidates:
-        candidates = [phases_dir / str(phase_number)]
-    phase_dir = candidates[0]
-    return phase_dir if phase_dir.is_dir() else None
+def _parse_plan(content: str) -> tuple[list[dict], list[str], bool]:
+    """Parse one PLAN.md: (tasks, depends_on plan IDs, mentions new components).
+
+    The frontmatter is split off once; the task and keyword scans only walk the body.
+    """
+    frontmatter, body = _split_frontmatter(content)
+    raw_deps = frontmatter.get("depends_on", [])
+    if isinstance(raw_deps, str):
+        raw_deps = [raw_deps]
+    return _extract_tasks_from_xml(body), [str(d) for d in raw_deps], _detect_new_components(body)
+
+
+# Parsed plans keyed by path, invalidated when (mtime_ns, size) changes
+_PLAN_CACHE: dict[Path, tuple[tuple[int, int], tuple[list[dict], list[str], bool]]] = {}
+
+
+def _load_plan(path: Path) -> tuple[list[dict], list[str], bool]:
+    """Read and parse a PLAN.md, reusing the previous parse while the file is unchanged.
+
+    The returned lists are shared with the cache — treat them as read-only.
+    """
+    st = path.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    hit = _PLAN_CACHE.get(path)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+    parsed = _parse_plan(path.read_text())
+    _PLAN_CACHE[path] = (stamp, parsed)
+    return parsed
 
 
 async def _parse_and_create_tasks(
@@ -176,37 +185,40 @@ async def _parse_and_create_tasks(
 ) -> tuple[dict[str, list[str]], dict[str, list[str]], list[dict], bool]:
     """Parse plan files and create Beads tasks.
 
+    Tasks are created concurrently (at most br_client.BR_MAX_CONCURRENCY br
+    processes at a time) across all plans; gather keeps results in plan and
+    task order, which the intra-plan dependency chain relies on.
+
     Returns:
         Tuple of (plan_tasks, plan_deps, tasks_created, has_new_components).
     """
-    plan_tasks: dict[str, list[str]] = {}
     plan_deps: dict[str, list[str]] = {}
-    tasks_created: list[dict] = []
+    to_create: list[tuple[str, int, dict]] = []
     has_new_components = False
 
-    for plan_id, plan_path in plan_files:
-        content = plan_path.read_text()
-        frontmatter = _extract_frontmatter(content)
-        parsed_tasks = _extract_tasks_from_xml(content)
+    # Read (or reuse) every plan off the event loop
+    parsed_plans = await asyncio.gather(*(asyncio.to_thread(_load_plan, plan_path) for _, plan_path in plan_files))
 
+    for (plan_id, _), (parsed_tasks, deps, new_components) in zip(plan_files, parsed_plans, strict=True):
         if not parsed_tasks:
             continue
+        plan_deps[plan_id] = deps
+        has_new_components = has_new_components or new_components
+        to_create.extend((plan_id, idx, task_data) for idx, task_data in enumerate(parsed_tasks))
 
-        raw_deps = frontmatter.get("depends_on", [])
-        if isinstance(raw_deps, str):
-            raw_deps = [raw_deps]
-        plan_deps[plan_id] = [str(d) for d in raw_deps]
+    sem = asyncio.Semaphore(br_client.BR_MAX_CONCURRENCY)
 
-        if _detect_new_components(content):
-            has_new_components = True
+    async def create(plan_id: str, idx: int, task_data: dict) -> str:
+        async with sem:
+            return await _create_beads_task(plan_id, idx, task_data)
 
-        issue_ids: list[str] = []
-        for idx, task_data in enumerate(parsed_tasks):
-            issue_id = await _create_beads_task(plan_id, idx, task_data)
-            issue_ids.append(issue_id)
-            tasks_created.append({"plan_id": plan_id, "task_index": idx, "issue_id": issue_id})
+    issue_ids = await asyncio.gather(*(create(*item) for item in to_create))
 
-        plan_tasks[plan_id] = issue_ids
+    plan_tasks: dict[str, list[str]] = {plan_id: [] for plan_id in plan_deps}
+    tasks_created: list[dict] = []
+    for (plan_id, idx, _), issue_id in zip(to_create, issue_ids, strict=True):
+        plan_tasks[plan_id].append(issue_id)
+        tasks_created.append({"plan_id": plan_id, "task_index": idx, "issue_id": issue_id})
 
     return plan_tasks, plan_deps, tasks_created, has_new_components
 
@@ -244,7 +256,7 @@ async def import_gsd_plan(phase_number: int) -> dict:
     Returns:
         dict with tasks_created, dependencies, and diagram_update_needed.
     """
-    if not config.components:
+    if not config.config.components:
         return {
             "error": "No components configured in vibraphone.yaml. Run configure_stack first.",
             "action_required": "configure_stack",
@@ -253,16 +265,14 @@ async def import_gsd_plan(phase_number: int) -> dict:
             ],
         }
 
-    phase_dir = _resolve_phase_dir(phase_number)
+    phase_dir = resolve_phase_dir(phase_number)
     if phase_dir is None:
         return {"error": f"Phase directory not found for phase {phase_number}"}
 
     # Discover plan files, sorted for deterministic ordering
-    plan_files: list[tuple[str, Path]] = []
-    for path in sorted(phase_dir.iterdir()):
-        match = _PLAN_FILE_RE.match(path.name)
-        if match:
-            plan_files.append((match.group(1), path))
+    with os.scandir(phase_dir) as entries:
+        matches = [(m.group(1), entry.path) for entry in entries if (m := _PLAN_FILE_RE.match(entry.name))]
+    plan_files = [(plan_id, Path(path)) for plan_id, path in sorted(matches, key=lambda item: item[1])]
 
     if not plan_files:
         return {"error": f"No PLAN.md files found in {phase_dir}"}
@@ -302,7 +312,9 @@ async def import_gsd_plan(phase_number: int) -> dict:
         "next_steps": next_steps,
     }
 
-    await br_client.br_sync()
+    # Edges must all exist before the export, so the sync can't overlap the
+    # dependency writes; it can share a run with other tools' syncs though
+    await br_client.br_sync_coalesced()
 
     session.audit_log(
         "import_gsd_plan",
@@ -5,47 +5,63 @@ from __future__ import annotations
 import asyncio
 import hashlib
 
-from config import config, project_root
+import config
 from utils import br_client, session
+from utils.worktree import working_dir, working_dir_for
 
+# Only the tail of a command's output is kept — test runners and linters put
+# their summary last, and a runaway traceback shouldn't be held in memory
+# (or copied into the audit log) in full
+SHELL_OUTPUT_TAIL_BYTES = 64 * 1024
 
-def _working_dir() -> str | None:
-    """Resolve the working directory for shell commands.
-
-    If a worktree is active in the session, return its absolute path so that
-    Justfile recipes (``cd ./src && ...``) resolve relative to the worktree.
-    Otherwise return None (inherit the process's cwd).
-    """
-    state = session.load_session()
-    if state and state.worktree:
-        return str((project_root() / state.worktree).resolve())
-    return None
 
+async def _run_shell(cmd: str, *, cwd: str | None) -> tuple[int, str]:
+    """Run a shell command in cwd and return (returncode, combined output tail).
 
-async def _run_shell(cmd: str) -> tuple[int, str]:
-    """Run a shell command and return (returncode, combined output)."""
+    Output is streamed from the pipe and trimmed to the last
+    SHELL_OUTPUT_TAIL_BYTES as it arrives, so memory stays bounded however
+    much the command prints.
+    """
     proc = await asyncio.create_subprocess_shell(
         cmd,
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.STDOUT,
-        cwd=_working_dir(),
+        cwd=cwd,
     )
-    stdout, _ = await proc.communicate()
-    return proc.returncode or 0, stdout.decode().strip()
-
-
-async def _git_diff_staged_hash() -> str:
-    """Return a SHA-256 hash of the current staged diff."""
+    tail = bytearray()
+    truncated = False
+    while chunk := await proc.stdout.read(65536):  # type: ignore[union-attr]
+        tail += chunk
+        if len(tail) > SHELL_OUTPUT_TAIL_BYTES:
+            del tail[:-SHELL_OUTPUT_TAIL_BYTES]
+            truncated = True
+    await proc.wait()
+    output = tail.decode(errors="replace").strip()
+    if truncated:
+        output = f"[... output truncated to last {SHELL_OUTPUT_TAIL_BYTES} bytes ...]\n{output}"
+    return proc.returncode or 0, output
+
+
+async def _git_diff_staged_hash(*, cwd: str | None) -> str:
+    """Return a BLAKE2b-128 hash of the current staged diff.
+
+    Used only for change detection (review vs. commit), not as a security
+    primitive. The diff is fed to the hasher in chunks straight from git's
+    stdout, so the full diff is never buffered.
+    """
     proc = await asyncio.create_subprocess_exec(
         "git",
         "diff",
         "--staged",
         stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-        cwd=_working_dir(),
+        stderr=asyncio.subprocess.DEVNULL,
+        cwd=cwd,
     )
-    stdout, _ = await proc.communicate()
-    return hashlib.sha256(stdout).hexdigest()
+    digest = hashlib.blake2b(digest_size=16)
+    while chunk := await proc.stdout.read(65536):  # type: ignore[union-attr]
+        digest.update(chunk)
+    await proc.wait()
+    return digest.hexdigest()
 
 
 async def run_tests(component: str | None = None, scope: str | None = None) -> dict:
@@ -54,7 +70,7 @@ async def run_tests(component: str | None = None, scope: str | None = None) -> d
     task_id = state.active_task or "unknown"
 
     attempt = session.increment_test_attempts(task_id)
-    max_attempts = config.quality_gate.max_test_attempts
+    max_attempts = config.config.quality_gate.max_test_attempts
 
     if attempt > max_attempts:
         await br_client.br_update(task_id, status="blocked")
@@ -74,7 +90,7 @@ async def run_tests(component: str | None = None, scope: str | None = None) -> d
     if scope:
         cmd = f"{cmd} {scope}"
 
-    rc, output = await _run_shell(cmd)
+    rc, output = await _run_shell(cmd, cwd=working_dir_for(state))
     status = "pass" if rc == 0 else "fail"
 
     result = {"status": status, "output": output, "attempt": attempt}
@@ -97,7 +113,7 @@ async def run_lint(component: str | None = None) -> dict:
     """Run linter. No circuit breaker."""
     cmd = f"just lint-{component}" if component else "just lint"
 
-    rc, output = await _run_shell(cmd)
+    rc, output = await _run_shell(cmd, cwd=working_dir())
     status = "pass" if rc == 0 else "fail"
 
     issues = []
@@ -125,7 +141,7 @@ async def run_format(component: str | None = None) -> dict:
     """Run formatter. No circuit breaker."""
     cmd = f"just format-{component}" if component else "just format"
 
-    rc, output = await _run_shell(cmd)
+    rc, output = await _run_shell(cmd, cwd=working_dir())
     status = "formatted" if rc == 0 else "error"
 
     result = {"status": status, "output": output}
@@ -143,15 +159,22 @@ async def attempt_commit(message: str) -> dict:
         session.audit_log("attempt_commit", {"message": message}, "rejected", result)
         return result
 
+    # Resolved once from the state already in hand and reused for every subprocess
+    cwd = working_dir_for(state)
+
+    # Preconditions 2 and 3 are independent (the quality gate doesn't touch the
+    # index), so hash the staged diff while `just check` runs
+    current_hash, (rc, check_output) = await asyncio.gather(
+        _git_diff_staged_hash(cwd=cwd), _run_shell("just check", cwd=cwd)
+    )
+
     # Precondition 2: Staged diff must match what was reviewed
-    current_hash = await _git_diff_staged_hash()
     if current_hash != state.last_review_diff_hash:
         result = {"status": "rejected", "reason": "Staged diff changed since review"}
         session.audit_log("attempt_commit", {"message": message}, "rejected", result)
         return result
 
     # Precondition 3: Quality gate must pass
-    rc, check_output = await _run_shell("just check")
     if rc != 0:
         result = {"status": "rejected", "reason": f"Quality gate failed: {check_output}"}
         session.audit_log("attempt_commit", {"message": message}, "rejected", result)
@@ -165,7 +188,7 @@ async def attempt_commit(message: str) -> dict:
         message,
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
-        cwd=_working_dir(),
+        cwd=cwd,
     )
     _stdout, stderr = await proc.communicate()
 
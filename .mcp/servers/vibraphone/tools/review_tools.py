@@ -6,17 +6,25 @@ Tools: request_code_review
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import hashlib
 import json
 import logging
 import os
 import re
-from pathlib import Path, PurePosixPath
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 from openai import AsyncOpenAI
 
-from config import config, project_root
-from utils import br_client, session
+import config
+from config import project_root
+from utils import br_client, jsonio, session
+from utils.textcache import read_if_exists
+from utils.worktree import working_dir, working_dir_for
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
 
 logger = logging.getLogger(__name__)
 
@@ -24,127 +32,148 @@ logger = logging.getLogger(__name__)
 # Dangerous-file detection for staging
 # ---------------------------------------------------------------------------
 
-_DANGEROUS_FILENAMES = {
-    ".env",
-    ".env.local",
-    ".env.production",
-    ".env.staging",
-    "credentials.json",
-    "service-account.json",
-    "secrets.json",
-    "id_rsa",
-    "id_ed25519",
-}
-
-_DANGEROUS_EXTENSIONS = {
-    ".pem",
-    ".key",
-    ".p12",
-    ".pfx",
-    ".jks",
-    ".keystore",
-}
-
-_DANGEROUS_PATH_PARTS = {
-    ".ssh",
-    ".gnupg",
-}
+_DANGEROUS_FILENAMES = frozenset(
+    {
+        ".env",
+        ".env.local",
+        ".env.production",
+        ".env.staging",
+        "credentials.json",
+        "service-account.json",
+        "secrets.json",
+        "id_rsa",
+        "id_ed25519",
+    }
+)
+
+_DANGEROUS_EXTENSIONS = frozenset(
+    {
+        ".pem",
+        ".key",
+        ".p12",
+        ".pfx",
+        ".jks",
+        ".keystore",
+    }
+)
 
+_DANGEROUS_PATH_PARTS = frozenset(
+    {
+        ".ssh",
+        ".gnupg",
+    }
+)
 
-def _is_dangerous(path: str) -> bool:
-    """Check if a file path matches known sensitive file patterns."""
-    p = PurePosixPath(path)
-    if p.name in _DANGEROUS_FILENAMES:
-        return True
-    if p.suffix in _DANGEROUS_EXTENSIONS:
-        return True
-    return bool(_DANGEROUS_PATH_PARTS & set(p.parts))
 
+def _alternation(items: frozenset[str]) -> str:
+    """Regex alternation matching any of the given literal strings."""
+    return "|".join(map(re.escape, sorted(items)))
 
-def _working_dir() -> str | None:
-    """Resolve the working directory for git commands.
 
-    If a worktree is active in the session, return its absolute path.
-    Otherwise return None (inherit the process's cwd).
-    """
-    state = session.load_session()
-    if state and state.worktree:
-        return str((project_root() / state.worktree).resolve())
-    return None
+# The sets above stay the source of truth; this folds all three checks into one scan
+_DANGEROUS_RE = re.compile(
+    rf"(?:^|/)(?:{_alternation(_DANGEROUS_FILENAMES)})$"
+    rf"|(?:{_alternation(_DANGEROUS_EXTENSIONS)})$"
+    rf"|(?:^|/)(?:{_alternation(_DANGEROUS_PATH_PARTS)})(?:/|$)"
+)
 
 
-async def _git_diff_staged() -> str:
-    """Return the text of the current staged diff."""
-    proc = await asyncio.create_subprocess_exec(
-        "git",
-        "diff",
-        "--staged",
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-        cwd=_working_dir(),
-    )
-    stdout, _ = await proc.communicate()
-    return stdout.decode()
+def _is_dangerous(path: str) -> bool:
+    """Check if a file path matches known sensitive file patterns."""
+    return _DANGEROUS_RE.search(path) is not None
 
 
-async def _git_diff_staged_hash() -> str:
-    """Return a SHA-256 hash of the current staged diff."""
+async def _git_diff_staged(*, cwd: str | None) -> bytes:
+    """Return the raw bytes of the current staged diff in cwd."""
     proc = await asyncio.create_subprocess_exec(
         "git",
         "diff",
         "--staged",
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
-        cwd=_working_dir(),
+        cwd=cwd,
     )
     stdout, _ = await proc.communicate()
-    return hashlib.sha256(stdout).hexdigest()
+    return stdout
+
+
+def _diff_hash(diff: bytes) -> str:
+    """Return a BLAKE2b-128 hash of a staged diff.
+
+    Used only for change detection (review vs. commit), not as a security
+    primitive. Must match quality_tools._git_diff_staged_hash, which streams
+    the same digest straight from git at commit time.
+    """
+    return hashlib.blake2b(diff, digest_size=16).hexdigest()
 
 
-async def _get_changed_files() -> list[str]:
-    """Return list of staged file paths."""
+async def _get_changed_files(*, cwd: str | None) -> list[str]:
+    """Return list of staged file paths in cwd.
+
+    Uses NUL-delimited output, so names are never quoted or split on newlines.
+    """
     proc = await asyncio.create_subprocess_exec(
         "git",
         "diff",
         "--staged",
         "--name-only",
+        "-z",
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
-        cwd=_working_dir(),
+        cwd=cwd,
     )
     stdout, _ = await proc.communicate()
-    return [f for f in stdout.decode().strip().splitlines() if f]
-
-
-def _read_file_contents(paths: list[str]) -> str:
-    """Read and format the contents of the given files for review context."""
-    wdir = _working_dir()
-    base = Path(wdir) if wdir else Path.cwd()
-    sections = []
-    for path in paths:
-        p = base / path
-        if p.exists() and p.is_file():
-            try:
-                content = p.read_text()
-                sections.append(f"## {path}\n```\n{content}\n```")
-            except (OSError, UnicodeDecodeError):
-                sections.append(f"## {path}\n(binary or unreadable)")
-    return "\n\n".join(sections)
-
-
-def _parse_porcelain(lines: list[str]) -> list[str]:
-    """Extract file paths from git status --porcelain output lines."""
+    return [os.fsdecode(name) for name in stdout.split(b"\0") if name]
+
+
+# A NUL byte in the first block marks a file as binary without reading the rest
+_BINARY_SNIFF_BYTES = 8192
+
+
+def _read_file_section(base: Path, path: str) -> str | None:
+    """Format one file for review context, or None if it isn't a regular file."""
+    p = base / path
+    if not p.is_file():
+        return None
+    try:
+        with p.open("rb") as f:
+            head = f.read(_BINARY_SNIFF_BYTES)
+            if b"\0" in head:
+                return f"## {path}\n(binary or unreadable)"
+            content = (head + f.read()).decode()
+    except (OSError, UnicodeDecodeError):
+        return f"## {path}\n(binary or unreadable)"
+    return f"## {path}\n```\n{content}\n```"
+
+
+async def _read_file_contents(paths: list[str], *, cwd: str | None) -> str:
+    """Read and format the contents of the given files for review context.
+
+    Files are read concurrently in the default executor, whose worker cap
+    also bounds how many are open at once; sections keep the input order.
+    """
+    base = Path(cwd) if cwd else Path.cwd()
+    sections = await asyncio.gather(*(asyncio.to_thread(_read_file_section, base, path) for path in paths))
+    return "\n\n".join(section for section in sections if section is not None)
+
+
+def _parse_porcelain(output: bytes) -> list[str]:
+    """Extract file paths from ``git status --porcelain=v1 -z`` output.
+
+    Records are NUL-terminated ``XY path`` entries with no quoting, so any
+    filename (spaces, quotes, newlines) round-trips. Renames and copies carry
+    the destination in their own record, followed by a bare source-path
+    record which is skipped.
+    """
     paths_out: list[str] = []
-    for line in lines:
-        if not line.strip():
+    records = iter(output.split(b"\0"))
+    for record in records:
+        if len(record) < 4:  # "XY " prefix plus at least one path byte
             continue
-        m = re.match(r"^..\s+(.+)$", line)
-        if m:
-            path = m.group(1).strip('"')
-            # For renames (R/C), take the destination path after " -> "
-            if " -> " in path:
-                path = path.split(" -> ", 1)[1]
-            paths_out.append(path)
+        paths_out.append(os.fsdecode(record[3:]))
+        xy = record[:2]
+        if b"R" in xy or b"C" in xy:
+            next(records, None)
     return paths_out
 
 
@@ -170,27 +199,30 @@ async def _stage_files(paths: list[str] | None, *, stage_all: bool) -> dict:
             "reason": "Provide either 'paths' or 'stage_all=True'.",
         }
 
-    cwd = _working_dir()
+    cwd = working_dir()
     logger.debug("_stage_files: cwd=%s", cwd or "(inherit)")
     warnings: list[str] = []
 
     if stage_all:
         # Discover changed files via git status
+        # -uall lists files inside untracked directories, so each one goes
+        # through the dangerous-file check instead of staging "dir/" wholesale
         proc = await asyncio.create_subprocess_exec(
             "git",
             "status",
-            "--porcelain",
+            "--porcelain=v1",
+            "-uall",
+            "-z",
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
             cwd=cwd,
         )
         stdout, _ = await proc.communicate()
-        raw_output = stdout.decode().rstrip()  # Only strip trailing whitespace, preserve leading XY
-        logger.debug("_stage_files: git status output=%r", raw_output)
-        lines = raw_output.splitlines()
-        candidates = _parse_porcelain(lines)
+        logger.debug("_stage_files: git status output=%r", stdout)
+        candidates = _parse_porcelain(stdout)
     else:
-        candidates = list(paths)  # type: ignore[arg-type]
+        # Order-preserving dedupe: repeated paths would be reported and added twice
+        candidates = list(dict.fromkeys(paths))  # type: ignore[arg-type]
 
     logger.debug("_stage_files: candidates=%r", candidates)
 
@@ -204,16 +236,20 @@ async def _stage_files(paths: list[str] | None, *, stage_all: bool) -> dict:
     if not safe:
         return {"status": "nothing_to_stage", "staged": [], "warnings": warnings}
 
+    # One atomic git add; paths go NUL-separated over stdin, so any number of
+    # them fits without hitting ARG_MAX and a failure stages nothing. fsencode
+    # restores the raw bytes of names _parse_porcelain couldn't decode
     proc = await asyncio.create_subprocess_exec(
         "git",
         "add",
-        "--",
-        *safe,
+        "--pathspec-from-file=-",
+        "--pathspec-file-nul",
+        stdin=asyncio.subprocess.PIPE,
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
         cwd=cwd,
     )
-    _, stderr = await proc.communicate()
+    _, stderr = await proc.communicate(b"\0".join(map(os.fsencode, safe)))
 
     if proc.returncode != 0:
         return {
@@ -226,6 +262,45 @@ async def _stage_files(paths: list[str] | None, *, stage_all: bool) -> dict:
     return {"status": "staged", "staged": safe, "warnings": warnings}
 
 
+# One client per (event loop, API key), so repeat reviews reuse its connection
+# pool and TLS sessions; a client must not outlive the loop it was used on
+_client: tuple[asyncio.AbstractEventLoop, str, AsyncOpenAI] | None = None
+# In-flight leases per client; a replaced client is closed when its count drops to zero
+_leases: dict[AsyncOpenAI, int] = {}
+
+
+async def _close_client(client: AsyncOpenAI) -> None:
+    # A client from a loop that has since closed can't shut its transports
+    # down cleanly; those sockets already went with that loop
+    with contextlib.suppress(RuntimeError):
+        await client.close()
+
+
+@contextlib.asynccontextmanager
+async def _review_client(api_key: str) -> AsyncIterator[AsyncOpenAI]:
+    """Lease the shared OpenRouter client for the running loop and api_key.
+
+    A client replaced by a new loop or key is closed once its last lease
+    ends, so reviews still using it finish on an open connection pool.
+    """
+    global _client
+    loop = asyncio.get_running_loop()
+    if _client is None or _client[0] is not loop or _client[1] != api_key:
+        old, _client = _client, (loop, api_key, AsyncOpenAI(api_key=api_key, base_url="https://openrouter.ai/api/v1"))
+        if old is not None and old[2] not in _leases:
+            await _close_client(old[2])
+    client = _client[2]
+    _leases[client] = _leases.get(client, 0) + 1
+    try:
+        yield client
+    finally:
+        _leases[client] -= 1
+        if not _leases[client]:
+            del _leases[client]
+            if _client is None or _client[2] is not client:
+                await _close_client(client)
+
+
 async def _perform_review(
     diff: str,
     files_content: str,
@@ -239,15 +314,10 @@ async def _perform_review(
 
     Returns dict with keys: status, issues, raw_response.
     """
-    client = AsyncOpenAI(
-        api_key=api_key,
-        base_url="https://openrouter.ai/api/v1",
-    )
-
     user_message = f"# RULES\n{constitution}\n\n# DIFF\n{diff}\n\n# FILES\n{files_content}"
 
     if previous_issues:
-        prev_json = json.dumps(previous_issues, indent=2)
+        prev_json = jsonio.dumps(previous_issues, indent=True).decode()
         user_message += (
             f"\n\n# PREVIOUS REVIEW ISSUES\n"
             f"The following issues were raised in a prior review of this code. "
@@ -257,34 +327,34 @@ async def _perform_review(
             f"Do NOT echo resolved issues.\n\n{prev_json}"
         )
 
-    response = await client.chat.completions.create(
-        model=model,
-        max_tokens=4096,
-        messages=[
-            {"role": "system", "content": prompt},
-            {"role": "user", "content": user_message},
-        ],
-    )
+    async with _review_client(api_key) as client:
+        response = await client.chat.completions.create(
+            model=model,
+            max_tokens=4096,
+            messages=[
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": user_message},
+            ],
+        )
 
     raw_text = (response.choices[0].message.content or "").strip()
 
     # Parse JSON response — handle markdown code fences
     json_text = raw_text
     if json_text.startswith("```"):
-        lines = json_text.splitlines()
-        # Remove opening fence (```json or ```)
-        lines = lines[1:]
-        # Remove closing fence
-        if lines and lines[-1].strip() == "```":
-            lines = lines[:-1]
-        json_text = "\n".join(lines)
+        # Remove opening fence line (```json or ```)
+        _, _, json_text = json_text.partition("\n")
+        # Remove closing fence line
+        head, _, last = json_text.rpartition("\n")
+        if last.strip() == "```":
+            json_text = head
 
     try:
-        issues = json.loads(json_text)
+        issues = jsonio.loads(json_text)
         if not isinstance(issues, list):
             msg = "Response is not a JSON array"
             raise TypeError(msg)  # noqa: TRY301
-    except (json.JSONDecodeError, TypeError):
+    except (json.JSONDecodeError, TypeError):  # orjson's JSONDecodeError subclasses json's
         return {
             "status": "ESCALATED",
             "issues": [],
@@ -293,28 +363,30 @@ async def _perform_review(
         }
 
     # Determine status based on severity threshold
-    threshold = config.quality_gate.review_severity_threshold
-    dominated_severities = {"error"}
-    if threshold == "warning":
-        dominated_severities.add("warning")
-
-    has_blocking = any(issue.get("severity") in dominated_severities for issue in issues)
+    blocking = config.config.quality_gate.review_blocking_severities
+    has_blocking = any(issue.get("severity") in blocking for issue in issues)
     status = "REJECTED" if has_blocking else "APPROVED"
 
     return {"status": status, "issues": issues, "raw_response": raw_text}
 
 
+def _dedupe_issues(issues: list[dict]) -> list[dict]:
+    """Drop repeated issues, keyed by (rule, file, line); first occurrence wins."""
+    seen: dict[tuple, dict] = {}
+    for issue in issues:
+        seen.setdefault((issue.get("rule"), issue.get("file"), issue.get("line")), issue)
+    return list(seen.values())
+
+
 def _load_review_files() -> tuple[str | None, str | None]:
     """Load constitution and prompt files.
 
     Returns tuple of (constitution, prompt), either of which may be None if not found.
+    Both are stat-cached, so repeat reviews only re-read a file after it changes.
     """
     root = project_root()
-    constitution_path = root / config.review.constitution_file
-    prompt_path = root / config.review.prompt_file
-
-    constitution = constitution_path.read_text() if constitution_path.exists() else None
-    prompt = prompt_path.read_text() if prompt_path.exists() else None
+    constitution = read_if_exists(root / config.config.review.constitution_file)
+    prompt = read_if_exists(root / config.config.review.prompt_file)
 
     return constitution, prompt
 
@@ -348,7 +420,7 @@ def _check_circuit_breaker(state: session.SessionState, task_id: str) -> dict |
 
     Returns an escalation result if max attempts exceeded, else None.
     """
-    max_attempts = config.quality_gate.max_review_attempts
+    max_attempts = config.config.quality_gate.max_review_attempts
     current_attempts = (state.review_attempts or {}).get(task_id, 0)
 
     if current_attempts >= max_attempts:
@@ -379,10 +451,10 @@ def _load_review_assets() -> tuple[str, str] | dict:
 
     if constitution is None:
         return _error_result(
-            f"Constitution file not found: {config.review.constitution_file}"
+            f"Constitution file not found: {config.config.review.constitution_file}"
         )
     if prompt is None:
-        return _error_result(f"Reviewer prompt not found: {config.review.prompt_file}")
+        return _error_result(f"Reviewer prompt not found: {config.config.review.prompt_file}")
 
     return constitution, prompt
 
@@ -500,8 +572,15 @@ async def request_code_review(
     staged_files = stage_result["staged"]
     warnings = stage_result.get("warnings", [])
 
-    # 4. Get staged diff
-    diff = await _git_diff_staged()
+    # Resolved once from the state already in hand; the helpers below reuse it
+    cwd = working_dir_for(state)
+
+    # 4. Get staged diff (once — the text and hash both come from these bytes),
+    # the staged file list and the review assets, all independent of each other
+    diff_bytes, changed_files, assets = await asyncio.gather(
+        _git_diff_staged(cwd=cwd), _get_changed_files(cwd=cwd), asyncio.to_thread(_load_review_assets)
+    )
+    diff = diff_bytes.decode()
     if not diff.strip():
         result = _error_result(
             "No staged changes to review",
@@ -511,8 +590,7 @@ async def request_code_review(
         session.audit_log("request_code_review", {}, "error", result)
         return result
 
-    # 5. Load review assets (constitution + prompt)
-    assets = _load_review_assets()
+    # 5. Check review assets (constitution + prompt)
     if isinstance(assets, dict):
         result = {**assets, "staged": staged_files, "warnings": warnings}
         session.audit_log("request_code_review", {}, "error", result)
@@ -520,7 +598,7 @@ async def request_code_review(
     constitution, prompt = assets
 
     # 6. Check for unchanged diff (short-circuit)
-    current_diff_hash = await _git_diff_staged_hash()
+    current_diff_hash = _diff_hash(diff_bytes)
     if (
         state.last_review_diff_hash
         and state.last_review_diff_hash == current_diff_hash
@@ -534,26 +612,26 @@ async def request_code_review(
     attempt = session.increment_review_attempts(task_id)
     previous_issues = state.last_review_issues if attempt >= 2 else None
 
-    changed_files = await _get_changed_files()
-    files_content = _read_file_contents(changed_files)
+    files_content = await _read_file_contents(changed_files, cwd=cwd)
 
     review_result = await _perform_review(
         diff=diff,
         files_content=files_content,
         constitution=constitution,
         prompt=prompt,
-        model=config.review.model,
+        model=config.config.review.model,
         api_key=api_key,
         previous_issues=previous_issues,
     )
 
     status = review_result["status"]
-    issues = review_result["issues"]
+    issues = _dedupe_issues(review_result["issues"])
 
     # 8. Update session state
     state = session.load_session() or session.SessionState()
     state.last_review_status = status
-    state.last_review_diff_hash = await _git_diff_staged_hash()
+    # The hash of the diff that was actually reviewed, not whatever is staged now
+    state.last_review_diff_hash = current_diff_hash
     state.last_review_issues = issues
     session.save_session(state)
 
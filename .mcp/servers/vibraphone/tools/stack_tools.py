@@ -2,13 +2,20 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import copy
+import os
+import stat
+import tempfile
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import yaml
+if TYPE_CHECKING:
+    from collections.abc import Callable
 
 from config import _find_config_file, reload_config
+from utils import jsonio, yamlio
 
 STITCH_MCP_ENTRY = {
     "command": "npx",
@@ -36,27 +43,80 @@ STACK_DEFAULTS: dict[str, dict[str, str]] = {
 }
 
 
+# Parsed files keyed by path, invalidated when (mtime_ns, size) changes
+_FILE_CACHE: dict[Path, tuple[tuple[int, int], dict]] = {}
+
+
+def _stamp(path: Path) -> tuple[int, int]:
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def _load_cached(path: Path, parse: Callable[[bytes], Any]) -> dict:
+    """Parse *path*, reusing the previous result while the file is unchanged.
+
+    The returned object is shared with the cache — copy it before mutating
+    unless the mutation is immediately written back via _store_cached.
+    """
+    stamp = _stamp(path)
+    hit = _FILE_CACHE.get(path)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+    data = parse(path.read_bytes()) or {}
+    _FILE_CACHE[path] = (stamp, data)
+    return data
+
+
+def _store_cached(path: Path, data: dict) -> None:
+    """Record *data* as the parsed contents of *path* just written."""
+    _FILE_CACHE[path] = (_stamp(path), data)
+
+
+def _atomic_write_bytes(path: Path, data: bytes, *, new_mode: int = 0o644) -> None:
+    """Write *data* to a unique sibling temp file, then rename it over *path*.
+
+    Readers never see a half-written file, and a failed write leaves the
+    previous contents in place. Symlinks are followed so the link survives,
+    and the existing file's permission bits are carried over (*new_mode* if
+    the file doesn't exist yet).
+    """
+    target = path.resolve()
+    try:
+        mode = stat.S_IMODE(target.stat().st_mode)
+    except FileNotFoundError:
+        mode = new_mode
+    fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    tmp = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        tmp.chmod(mode)
+        tmp.replace(target)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
 def _sync_mcp_config(*, stitch_enabled: bool, project_root: Path) -> dict:
     """Add or remove the stitch entry in .mcp/config.json based on stitch_enabled."""
     config_path = project_root / ".mcp" / "config.json"
-    with config_path.open() as f:
-        config = json.load(f)
+    config = _load_cached(config_path, jsonio.loads)
 
-    servers = config.setdefault("mcpServers", {})
-    has_stitch = "stitch" in servers
-    changed = False
-
-    if stitch_enabled and not has_stitch:
-        servers["stitch"] = STITCH_MCP_ENTRY
-        changed = True
-    elif not stitch_enabled and has_stitch:
-        del servers["stitch"]
-        changed = True
+    has_stitch = "stitch" in config.get("mcpServers", {})
+    changed = stitch_enabled != has_stitch
 
     if changed:
-        with config_path.open("w") as f:
-            json.dump(config, f, indent=2)
-            f.write("\n")
+        servers = config.setdefault("mcpServers", {})
+        if stitch_enabled:
+            servers["stitch"] = STITCH_MCP_ENTRY
+        else:
+            del servers["stitch"]
+        try:
+            _atomic_write_bytes(config_path, jsonio.dumps(config, indent=True))
+        except OSError:
+            _FILE_CACHE.pop(config_path, None)  # cached dict was mutated above
+            raise
+        _store_cached(config_path, config)
 
     return {
         "stitch_config_changed": changed,
@@ -65,35 +125,83 @@ def _sync_mcp_config(*, stitch_enabled: bool, project_root: Path) -> dict:
     }
 
 
-def _update_env_var(key: str, value: str, project_root: Path) -> bool:
-    """Update or append a key=value pair in .env, creating from .env.example if needed."""
-    env_path = project_root / ".env"
-    if not env_path.exists():
-        example_path = project_root / ".env.example"
-        if example_path.exists():
-            env_path.write_text(example_path.read_text())
-        else:
-            env_path.write_text("")
-
-    lines = env_path.read_text().splitlines()
-    found = False
-    new_lines = []
-    for line in lines:
-        if line.startswith((f"{key}=", f"{key} =")):
-            new_lines.append(f"{key}={value}")
-            found = True
-        else:
-            new_lines.append(line)
+# Parsed .env files keyed by path, invalidated when (mtime_ns, size) changes
+_ENV_CACHE: dict[Path, tuple[tuple[int, int], _EnvFile]] = {}
+
+
+@dataclass(slots=True)
+class _EnvFile:
+    """A .env file as raw lines plus a key -> line-number index.
+
+    Comments, blank lines and ordering are kept verbatim; only the KEY=value
+    lines passed to set() are rewritten.
+    """
 
-    if not found:
-        new_lines.append(f"{key}={value}")
+    path: Path
+    lines: list[str]
+    keys: dict[str, list[int]]
+    exists: bool
+
+    @classmethod
+    def load(cls, path: Path, template: Path) -> _EnvFile:
+        """Return *path* parsed (cached by stamp), seeded from *template* if missing."""
+        try:
+            stamp = _stamp(path)
+        except FileNotFoundError:
+            text = template.read_text() if template.exists() else ""
+            return cls.parse(path, text, exists=False)
+        hit = _ENV_CACHE.get(path)
+        if hit is not None and hit[0] == stamp:
+            return hit[1]
+        env = cls.parse(path, path.read_text(), exists=True)
+        _ENV_CACHE[path] = (stamp, env)
+        return env
+
+    @classmethod
+    def parse(cls, path: Path, text: str, *, exists: bool) -> _EnvFile:
+        """Split *text* into lines and index every ``KEY=`` / ``KEY =`` line."""
+        lines = text.splitlines()
+        keys: dict[str, list[int]] = {}
+        for i, line in enumerate(lines):
+            name, sep, _ = line.partition("=")
+            if sep:
+                keys.setdefault(name.rstrip(" "), []).append(i)
+        return cls(path, lines, keys, exists)
+
+    def set(self, key: str, value: str) -> bool:
+        """Point every line for *key* at *value*, appending one if absent; True if changed."""
+        entry = f"{key}={value}"
+        indexes = self.keys.get(key)
+        if not indexes:
+            self.keys[key] = [len(self.lines)]
+            self.lines.append(entry)
+            return True
+        changed = False
+        for i in indexes:
+            if self.lines[i] != entry:
+                self.lines[i] = entry
+                changed = True
+        return changed
+
+    def flush(self) -> None:
+        """Atomically write the lines back and refresh the cache entry."""
+        try:
+            # A new .env holds secrets: owner-only until someone says otherwise
+            _atomic_write_bytes(self.path, ("\n".join(self.lines) + "\n").encode(), new_mode=0o600)
+        except OSError:
+            _ENV_CACHE.pop(self.path, None)  # lines were mutated by set()
+            raise
+        self.exists = True
+        _ENV_CACHE[self.path] = (_stamp(self.path), self)
 
-    new_content = "\n".join(new_lines) + "\n"
-    old_content = env_path.read_text()
-    if new_content != old_content:
-        env_path.write_text(new_content)
-        return True
-    return False
+
+def _update_env_var(key: str, value: str, project_root: Path) -> bool:
+    """Update or append a key=value pair in .env, creating from .env.example if needed."""
+    env = _EnvFile.load(project_root / ".env", project_root / ".env.example")
+    changed = env.set(key, value)
+    if changed or not env.exists:
+        env.flush()
+    return changed
 
 
 def _render_component_recipes(name: str, root: str, commands: dict[str, str]) -> str:
@@ -295,7 +403,7 @@ def _render_vibraphone_yaml(components: dict[str, dict[str, Any]], existing_conf
 
     # Replace components in existing config
     existing_config["components"] = new_components
-    return yaml.dump(existing_config, default_flow_style=False, sort_keys=False)
+    return yamlio.dump(existing_config, default_flow_style=False, sort_keys=False)
 
 
 async def configure_stack(
@@ -319,8 +427,8 @@ async def configure_stack(
     config_path = _find_config_file()
     existing_config: dict = {}
     if config_path and config_path.exists():
-        with config_path.open() as f:
-            existing_config = yaml.safe_load(f) or {}
+        # Deep copy: existing_config is mutated below while rendering
+        existing_config = copy.deepcopy(_load_cached(config_path, yamlio.load))
 
     # If stitch_project_id provided, update the stitch section before rendering
     if stitch_project_id:
@@ -352,18 +460,22 @@ async def configure_stack(
     project_root = config_path.parent if config_path else Path.cwd()
 
     justfile_path = project_root / "Justfile"
-    justfile_path.write_text(justfile_content)
-
     yaml_path = project_root / "vibraphone.yaml"
-    yaml_path.write_text(yaml_content)
+    stitch_enabled = existing_config.get("stitch", {}).get("enabled", False)
 
+    # The writes touch distinct files, so run them off the event loop concurrently;
+    # the MCP config sync (read→modify→write) stays serial within its own thread.
+    writes = [
+        asyncio.to_thread(_atomic_write_bytes, justfile_path, justfile_content.encode()),
+        asyncio.to_thread(_atomic_write_bytes, yaml_path, yaml_content.encode()),
+    ]
     # Handle stitch project ID provisioning
     if stitch_project_id:
-        _update_env_var("STITCH_PROJECT_ID", stitch_project_id, project_root)
-
-    # Sync MCP config based on stitch.enabled
-    stitch_enabled = existing_config.get("stitch", {}).get("enabled", False)
-    mcp_sync_result = _sync_mcp_config(stitch_enabled=stitch_enabled, project_root=project_root)
+        writes.append(asyncio.to_thread(_update_env_var, "STITCH_PROJECT_ID", stitch_project_id, project_root))
+    mcp_sync_result, *_ = await asyncio.gather(
+        asyncio.to_thread(_sync_mcp_config, stitch_enabled=stitch_enabled, project_root=project_root),
+        *writes,
+    )
 
     # Reload config singleton so quality tools pick up new components
     reload_config()
@@ -5,7 +5,8 @@ from __future__ import annotations
 import asyncio
 import re
 
-from config import config, project_root
+import config
+from config import project_root
 from tools.beads_tools import get_task_context
 from utils import br_client, session
 
@@ -51,12 +52,12 @@ async def start_task(task_id: str) -> dict:
     """Create a worktree and branch for a task, mark it in-progress."""
     await br_client.br_update(task_id, status="in_progress")
     # Sync so other agents (and bv) see this task is claimed
-    if config.beads.auto_sync:
+    if config.config.beads.auto_sync:
         await br_client.br_sync()
     await _run_just("start-task", task_id)
 
     worktree_path = f"./worktrees/{task_id}"
-    branch = f"{config.worktree.prefix}{task_id}"
+    branch = f"{config.config.worktree.prefix}{task_id}"
 
     state = session.load_session() or session.SessionState()
     state.active_task = task_id
@@ -97,8 +98,8 @@ async def merge_task(task_id: str) -> dict:
     On conflict, aborts rebase and returns structured error.
     On success, returns next_steps instructing agent to leave worktree.
     """
-    branch = f"{config.worktree.prefix}{task_id}"
-    base = config.worktree.base_branch
+    branch = f"{config.config.worktree.prefix}{task_id}"
+    base = config.config.worktree.base_branch
     root = str(project_root())
     worktree_path = str((project_root() / "worktrees" / task_id).resolve())
 
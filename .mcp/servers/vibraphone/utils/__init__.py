@@ -1 +1 @@
-"""Shared utilities — Beads CLI client and session state management."""
+"""Shared utilities — Beads CLI client, session state, planning/worktree paths and cached file reads."""
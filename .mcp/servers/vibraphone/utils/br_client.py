@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import json
-from enum import IntEnum
+import shutil
 
 
 class BrError(Exception):
@@ -17,9 +18,15 @@ class BrError(Exception):
         super().__init__(f"br {' '.join(args)} failed (rc={returncode}): {stderr}")
 
 
+@functools.cache
+def _executable(name: str) -> str:
+    """Resolve *name* on PATH once per process; unresolved names are left for exec to search."""
+    return shutil.which(name) or name
+
+
 async def br_run(*args: str) -> dict:
     """Run ``br <args> --json`` and return parsed JSON output."""
-    cmd = ["br", *args, "--json"]
+    cmd = [_executable("br"), *args, "--json"]
     proc = await asyncio.create_subprocess_exec(
         *cmd,
         stdout=asyncio.subprocess.PIPE,
@@ -95,69 +102,133 @@ async def br_dep_add(issue: str, depends_on: str, dep_type: str = "blocks") -> d
     return await br_run("dep", "add", issue, depends_on, "--type", dep_type)
 
 
+# Upper bound on concurrent br processes for fan-out helpers; br serializes
+# writes on its database, so more processes only add lock contention
+BR_MAX_CONCURRENCY = 8
+
+
+async def br_dep_add_many(edges: list[tuple[str, str]]) -> list[dict]:
+    """Add many (issue, depends_on) blocking edges, up to BR_MAX_CONCURRENCY at a time.
+
+    Results are returned in the order of *edges*.
+    """
+    sem = asyncio.Semaphore(BR_MAX_CONCURRENCY)
+
+    async def add(issue: str, depends_on: str) -> dict:
+        async with sem:
+            return await br_dep_add(issue, depends_on)
+
+    return await asyncio.gather(*(add(issue, depends_on) for issue, depends_on in edges))
+
+
 async def br_doctor() -> dict:
     """Run br doctor health check."""
     return await br_run("doctor")
 
 
-def detect_cycles(tasks: list[dict]) -> list[list[str]]:
-    """Detect dependency cycles in a task list via DFS.
+def _strongconnect(
+    root: str,
+    adj: dict[str, tuple[str, ...]],
+    index: dict[str, int],
+    lowlink: dict[str, int],
+) -> list[list[str]]:
+    """Run one iterative Tarjan traversal from *root* and return the SCCs it closes.
 
-    Each task dict should have an 'id' field and optionally a 'dependencies'
-    field (list of task IDs this task depends on).  Returns a list of cycles,
-    where each cycle is a list of task IDs forming the loop.
+    *index* and *lowlink* are shared across traversals so already-visited
+    nodes are skipped by the caller.
     """
-    adj: dict[str, list[str]] = {}
-    for t in tasks:
-        tid = str(t.get("id", ""))
-        deps = [str(d) for d in (t.get("dependencies") or [])]
-        adj[tid] = deps
-
-    class _Color(IntEnum):
-        WHITE = 0
-        GRAY = 1
-        BLACK = 2
-
-    color: dict[str, _Color] = dict.fromkeys(adj, _Color.WHITE)
-    cycles: list[list[str]] = []
-    path: list[str] = []
-
-    def dfs(node: str) -> None:
-        color[node] = _Color.GRAY
-        path.append(node)
-        for neighbour in adj.get(node, []):
-            if neighbour not in color:
+    stack: list[str] = []
+    stack_pos: dict[str, int] = {}  # node -> position on stack, while on it
+    components: list[list[str]] = []
+
+    def visit(node: str) -> None:
+        index[node] = lowlink[node] = len(index)
+        stack_pos[node] = len(stack)
+        stack.append(node)
+
+    visit(root)
+    work = [(root, iter(adj[root]))]
+    while work:
+        node, neighbours = work[-1]
+        for neighbour in neighbours:
+            if neighbour not in adj:
                 continue
-            if color[neighbour] == _Color.GRAY:
-                idx = path.index(neighbour)
-                cycles.append([*path[idx:], neighbour])
-            elif color[neighbour] == _Color.WHITE:
-                dfs(neighbour)
-        path.pop()
-        color[node] = _Color.BLACK
+            if neighbour not in index:
+                visit(neighbour)
+                work.append((neighbour, iter(adj[neighbour])))
+                break
+            if neighbour in stack_pos:
+                lowlink[node] = min(lowlink[node], index[neighbour])
+        else:
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                pos = stack_pos[node]
+                component = stack[pos:]
+                del stack[pos:]
+                for member in component:
+                    del stack_pos[member]
+                components.append(component)
+    return components
+
+
+# (task_id, dependency_ids) pairs — the only task fields the graph checks read
+_Graph = tuple[tuple[str, tuple[str, ...]], ...]
+
+
+def _graph_key(tasks: list[dict]) -> _Graph:
+    """Snapshot the dependency graph of *tasks* as a hashable cache key."""
+    return tuple((str(t.get("id", "")), tuple(map(str, t.get("dependencies") or ()))) for t in tasks)
 
-    for node in list(adj):
-        if color[node] == _Color.WHITE:
-            dfs(node)
 
-    return cycles
+def detect_cycles(tasks: list[dict]) -> list[list[str]]:
+    """Detect dependency cycles in a task list via Tarjan's SCC algorithm.
+
+    Each task dict should have an 'id' field and optionally a 'dependencies'
+    field (list of task IDs this task depends on).  Returns a list of cycles,
+    where each cycle is the list of task IDs in one strongly connected
+    component (size > 1, or a single task that depends on itself).
+
+    Runs iteratively with an explicit work stack, so deep dependency chains
+    don't hit Python's recursion limit.  Results are memoized on the graph
+    snapshot, so repeat health checks of an unchanged task set are lookups.
+    """
+    return [list(cycle) for cycle in _detect_cycles_cached(_graph_key(tasks))]
+
+
+@functools.lru_cache(maxsize=16)
+def _detect_cycles_cached(graph: _Graph) -> tuple[tuple[str, ...], ...]:
+    adj: dict[str, tuple[str, ...]] = dict(graph)
+
+    index: dict[str, int] = {}
+    lowlink: dict[str, int] = {}
+    cycles: list[tuple[str, ...]] = []
+    for root in adj:
+        if root in index:
+            continue
+        cycles.extend(
+            tuple(component)
+            for component in _strongconnect(root, adj, index, lowlink)
+            if len(component) > 1 or component[0] in adj[component[0]]
+        )
+    return tuple(cycles)
 
 
 def detect_orphans(tasks: list[dict]) -> list[dict]:
     """Find tasks whose dependencies reference non-existent task IDs.
 
     Returns a list of ``{"task_id": ..., "missing_dep": ...}`` dicts.
+    Memoized on the graph snapshot, like detect_cycles.
     """
-    known_ids = {str(t.get("id", "")) for t in tasks}
-    orphans: list[dict] = []
-    for t in tasks:
-        tid = str(t.get("id", ""))
-        orphans.extend(
-            {"task_id": tid, "missing_dep": str(dep)}
-            for dep in (t.get("dependencies") or [])
-            if str(dep) not in known_ids
-        )
-    return orphans
+    return [{"task_id": tid, "missing_dep": dep} for tid, dep in _detect_orphans_cached(_graph_key(tasks))]
+
+
+@functools.lru_cache(maxsize=16)
+def _detect_orphans_cached(graph: _Graph) -> tuple[tuple[str, str], ...]:
+    known_ids = {tid for tid, _ in graph}
+    return tuple((tid, dep) for tid, deps in graph for dep in deps if dep not in known_ids)
 
 
 async def br_sync() -> dict:
@@ -165,9 +236,41 @@ async def br_sync() -> dict:
     return await br_run("sync", "--flush-only")
 
 
+# Callers within this window of each other share one br sync run
+BR_SYNC_DEBOUNCE_SECONDS = 0.05
+_sync_next: asyncio.Task | None = None  # debounced sync not yet started
+_sync_running: asyncio.Task | None = None  # most recently started sync
+
+
+async def br_sync_coalesced() -> dict:
+    """Request a br sync, sharing one run with every caller in the debounce window.
+
+    A sync that has already started never satisfies a later request, so
+    changes made before the call are always exported; syncs never overlap.
+    """
+    global _sync_next
+    loop = asyncio.get_running_loop()
+    if _sync_next is None or _sync_next.done() or _sync_next.get_loop() is not loop:
+        _sync_next = loop.create_task(_debounced_sync())
+    # shield: one caller being cancelled must not cancel the shared sync
+    return await asyncio.shield(_sync_next)
+
+
+async def _debounced_sync() -> dict:
+    global _sync_next, _sync_running
+    await asyncio.sleep(BR_SYNC_DEBOUNCE_SECONDS)
+    me = asyncio.current_task()
+    if _sync_next is me:
+        _sync_next = None  # later callers start a new window
+    previous, _sync_running = _sync_running, me
+    if previous is not None and not previous.done() and previous.get_loop() is me.get_loop():  # type: ignore[union-attr]
+        await asyncio.wait([previous])
+    return await br_sync()
+
+
 async def bv_run(*args: str) -> dict:
     """Run ``bv <args>`` and return parsed JSON output."""
-    cmd = ["bv", *args]
+    cmd = [_executable("bv"), *args]
     proc = await asyncio.create_subprocess_exec(
         *cmd,
         stdout=asyncio.subprocess.PIPE,
@@ -189,27 +292,17 @@ async def bv_run(*args: str) -> dict:
 
 async def git_log(branch: str, count: int = 10) -> str | None:
     """Return ``git log --oneline -N branch`` output, or None if branch doesn't exist."""
-    # Check if branch exists
-    check = await asyncio.create_subprocess_exec(
-        "git",
-        "rev-parse",
-        "--verify",
-        branch,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    await check.communicate()
-    if check.returncode:
-        return None
-
+    # A missing branch makes git log itself fail, so no separate rev-parse
+    # probe is needed; "--" keeps a branch name from being read as a path
     proc = await asyncio.create_subprocess_exec(
         "git",
         "log",
         "--oneline",
-        f"-{count}",
+        f"--max-count={count}",
         branch,
+        "--",
         stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
     )
     stdout, _ = await proc.communicate()
     if proc.returncode:
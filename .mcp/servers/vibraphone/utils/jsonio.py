@@ -0,0 +1,23 @@
+"""JSON encode/decode helpers — orjson when installed, stdlib json otherwise."""
+
+from __future__ import annotations
+
+import json
+
+try:
+    import orjson
+except ImportError:  # optional speedup — see the "fast" extra in pyproject.toml
+    orjson = None
+
+
+def dumps(obj: object, *, indent: bool = False) -> bytes:
+    """Serialize to newline-terminated JSON bytes (2-space indent if requested)."""
+    if orjson is not None:
+        option = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return (json.dumps(obj, indent=2 if indent else None) + "\n").encode()
+
+
+loads = orjson.loads if orjson is not None else json.loads
@@ -0,0 +1,33 @@
+"""GSD planning layout helpers — locating phase directories under .planning/phases."""
+
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING
+
+from config import project_root
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def resolve_phase_dir(phase_number: int | str) -> Path | None:
+    """Locate the phase directory for a given phase number.
+
+    The directory scan is memoized on the mtime of .planning/phases, so it
+    only reruns after a phase directory is added, removed or renamed.
+    """
+    phases_dir = project_root() / ".planning" / "phases"
+    try:
+        mtime_ns = phases_dir.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _scan_phase_dir(phases_dir, str(phase_number), mtime_ns)
+
+
+@functools.lru_cache(maxsize=64)
+def _scan_phase_dir(phases_dir: Path, phase_number: str, _mtime_ns: int) -> Path | None:
+    # GSD uses zero-padded directory names like "01-core-crawler-foundation"
+    first = min(phases_dir.glob(f"{phase_number.zfill(2)}-*"), default=None)
+    phase_dir = first or phases_dir / phase_number
+    return phase_dir if phase_dir.is_dir() else None
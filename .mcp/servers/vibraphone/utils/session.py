@@ -2,17 +2,33 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import atexit
+import contextlib
+import threading
 from dataclasses import asdict, dataclass, field
 from datetime import UTC, datetime
 from pathlib import Path
 
+from utils import jsonio
+
 SESSION_DIR = Path(".vibraphone")
 SESSION_FILE = SESSION_DIR / "session.json"
 AUDIT_LOG = SESSION_DIR / "audit.log"
 
+# Audit entries are buffered per log file and appended in batches, or after
+# AUDIT_FLUSH_SECONDS when called from inside the server's event loop
+AUDIT_FLUSH_EVERY = 16
+AUDIT_FLUSH_SECONDS = 0.1
+_audit_buffer: dict[Path, list[bytes]] = {}
+_flush_timer: tuple[asyncio.AbstractEventLoop, asyncio.TimerHandle] | None = None
+# _audit_buffer_lock guards the buffer itself (held only for appends and the
+# swap); _audit_write_lock serialises writers so batches land in order
+_audit_buffer_lock = threading.Lock()
+_audit_write_lock = threading.Lock()
+
 
-@dataclass
+@dataclass(slots=True)
 class SessionState:
     """Persisted session state for crash recovery and quality-gate tracking."""
 
@@ -33,18 +49,44 @@ def _ensure_dir() -> None:
     SESSION_DIR.mkdir(parents=True, exist_ok=True)
 
 
+# Last state read or written, keyed by (path, mtime_ns, size) of the session file
+_cached: tuple[Path, tuple[int, int], SessionState] | None = None
+
+
+def _stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
 def load_session() -> SessionState | None:
-    """Load session state from disk. Returns None if no session file exists."""
-    if not SESSION_FILE.exists():
+    """Load session state from disk. Returns None if no session file exists.
+
+    While the file is unchanged on disk, the in-process state is returned
+    without re-reading it. Callers that mutate the result must persist it
+    with save_session().
+    """
+    global _cached
+    stamp = _stamp(SESSION_FILE)
+    if stamp is None:
         return None
-    raw = json.loads(SESSION_FILE.read_text())
-    return SessionState(**raw)
+    if _cached is not None and _cached[0] == SESSION_FILE and _cached[1] == stamp:
+        return _cached[2]
+    raw = jsonio.loads(SESSION_FILE.read_bytes())
+    state = SessionState(**raw)
+    _cached = (SESSION_FILE, stamp, state)
+    return state
 
 
 def save_session(state: SessionState) -> None:
     """Write session state to disk."""
+    global _cached
     _ensure_dir()
-    SESSION_FILE.write_text(json.dumps(asdict(state), indent=2) + "\n")
+    SESSION_FILE.write_bytes(jsonio.dumps(asdict(state), indent=True))
+    stamp = _stamp(SESSION_FILE)
+    _cached = (SESSION_FILE, stamp, state) if stamp is not None else None
 
 
 def increment_test_attempts(task_id: str) -> int:
@@ -77,12 +119,15 @@ def clear_task() -> None:
     save_session(state)
 
 
-def audit_log(tool: str, inputs: dict, status: str, output: dict) -> None:
+def audit_log(tool: str, inputs: dict, status: str, output: dict, *, durable: bool = False) -> None:
     """Append a structured entry to the audit log and update session state.
 
     Combines audit logging with session bookkeeping so every tool invocation
     automatically keeps last_action / last_action_result / last_action_time
-    current for crash recovery.
+    current for crash recovery. Session state is written immediately; the
+    audit entry is buffered and appended every AUDIT_FLUSH_EVERY entries or
+    AUDIT_FLUSH_SECONDS later (see flush_audit_log). Pass durable=True for
+    terminal events that must hit disk before the tool returns.
     """
     now = datetime.now(UTC).isoformat()
 
@@ -93,8 +138,7 @@ def audit_log(tool: str, inputs: dict, status: str, output: dict) -> None:
     state.last_action_time = now
     save_session(state)
 
-    # Append audit entry
-    _ensure_dir()
+    # Buffer audit entry; flushed in batches and at interpreter exit
     entry = {
         "timestamp": now,
         "tool": tool,
@@ -102,5 +146,83 @@ def audit_log(tool: str, inputs: dict, status: str, output: dict) -> None:
         "status": status,
         "output": output,
     }
-    with AUDIT_LOG.open("a") as f:
-        f.write(json.dumps(entry) + "\n")
+    line = jsonio.dumps(entry)
+    # Keyed by absolute path so a cwd change before the flush can't redirect it
+    log_path = AUDIT_LOG.absolute()
+    with _audit_buffer_lock:
+        pending = _audit_buffer.setdefault(log_path, [])
+        pending.append(line)
+        flush_now = durable or len(pending) >= AUDIT_FLUSH_EVERY
+    if flush_now:
+        flush_audit_log()
+    else:
+        _schedule_flush()
+
+
+def _schedule_flush() -> None:
+    """Arm a one-shot flush timer on the running event loop, if any."""
+    global _flush_timer
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:  # sync caller — batch size and atexit cover it
+        return
+    if _flush_timer is not None and _flush_timer[0] is loop:
+        return
+    _flush_timer = (loop, loop.call_later(AUDIT_FLUSH_SECONDS, _flush_in_background))
+
+
+def _flush_in_background() -> None:
+    """Timer callback: write the buffered entries from a worker thread."""
+    global _flush_timer
+    _flush_timer = None
+    asyncio.get_running_loop().run_in_executor(None, _write_audit_buffer)
+
+
+def _cancel_flush_timer() -> None:
+    """Disarm the pending flush timer, cancelling it on its own loop's thread.
+
+    TimerHandle.cancel() isn't thread-safe, so from any other thread the
+    cancel is handed to the loop with call_soon_threadsafe.
+    """
+    global _flush_timer
+    if _flush_timer is None:
+        return
+    (loop, handle), _flush_timer = _flush_timer, None
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        handle.cancel()
+        return
+    with contextlib.suppress(RuntimeError):  # loop already closed; the timer went with it
+        loop.call_soon_threadsafe(handle.cancel)
+
+
+def flush_audit_log() -> None:
+    """Append all buffered audit entries to their log files."""
+    _cancel_flush_timer()
+    _write_audit_buffer()
+
+
+async def audit_flush() -> None:
+    """Flush buffered audit entries without blocking the event loop (e.g. at shutdown)."""
+    _cancel_flush_timer()
+    await asyncio.to_thread(_write_audit_buffer)
+
+
+def _write_audit_buffer() -> None:
+    global _audit_buffer
+    # The write lock keeps batches in order when a background write overlaps a
+    # sync flush; the buffer is swapped out whole so no append can land in a
+    # list that has already been written
+    with _audit_write_lock:
+        with _audit_buffer_lock:
+            batch, _audit_buffer = _audit_buffer, {}
+        for path, lines in batch.items():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("ab") as f:
+                f.writelines(lines)
+
+
+atexit.register(flush_audit_log)
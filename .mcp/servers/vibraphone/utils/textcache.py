@@ -0,0 +1,30 @@
+"""Stat-cached text reads for small project files (plans, architecture, review prompts)."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# File texts keyed by path, invalidated when (mtime_ns, size) changes
+_TEXT_CACHE: dict[Path, tuple[tuple[int, int], str]] = {}
+
+
+def read_if_exists(path: Path) -> str | None:
+    """Return the file's text, or None if it doesn't exist.
+
+    Unchanged files cost one stat(); the text is reused from _TEXT_CACHE.
+    """
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        _TEXT_CACHE.pop(path, None)
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+    hit = _TEXT_CACHE.get(path)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+    text = path.read_text()
+    _TEXT_CACHE[path] = (stamp, text)
+    return text
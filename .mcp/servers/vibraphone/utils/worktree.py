@@ -0,0 +1,35 @@
+"""Working-directory resolution for git and shell commands run against the session worktree."""
+
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING
+
+from config import project_root
+from utils import session
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def working_dir_for(state: session.SessionState | None) -> str | None:
+    """Resolve the working directory for git and shell commands from session state.
+
+    If a worktree is active in the session, return its absolute path.
+    Otherwise return None (inherit the process's cwd). Path resolution is
+    memoized by resolve_worktree.
+    """
+    if state and state.worktree:
+        return resolve_worktree(project_root(), state.worktree)
+    return None
+
+
+def working_dir() -> str | None:
+    """Resolve the working directory from the current (stat-cached) session."""
+    return working_dir_for(session.load_session())
+
+
+@functools.lru_cache(maxsize=16)
+def resolve_worktree(root: Path, worktree: str) -> str:
+    """Absolute path of a session worktree, memoized per (project root, worktree)."""
+    return str((root / worktree).resolve())
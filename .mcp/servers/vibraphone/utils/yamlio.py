@@ -0,0 +1,38 @@
+"""YAML load/dump helpers — libyaml's C classes when available, PyYAML imported on first use.
+
+PyYAML is only imported inside these functions, so importing a module that
+might parse YAML doesn't pay for it at server startup.
+"""
+
+from __future__ import annotations
+
+import functools
+from typing import IO, Any
+
+
+@functools.cache
+def _loader() -> type:
+    import yaml
+
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@functools.cache
+def _dumper() -> type:
+    import yaml
+
+    return getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def load(stream: str | bytes | IO[bytes]) -> Any:  # noqa: ANN401
+    """Parse one YAML document with the safe loader."""
+    import yaml
+
+    return yaml.load(stream, Loader=_loader())  # noqa: S506 — safe loader
+
+
+def dump(obj: object, **kwargs: Any) -> str:  # noqa: ANN401
+    """Serialize *obj* with the safe dumper; kwargs go to yaml.dump."""
+    import yaml
+
+    return yaml.dump(obj, Dumper=_dumper(), **kwargs)